@@ -21,7 +21,8 @@ class MapGraphScrapeManeuver(OrdnanceManeuver[MapGraphPilot, Optional[any]]):
     graph_maneuver = MapGraphsEntryManeuver(
       entry_key=entry_key,
       map_context=self.map_context,
-      map_context_urls=map_context_urls
+      map_context_urls=map_context_urls,
+      profile=pilot.profile
     )
     fly(graph_maneuver)
     self.load(graph_maneuver.deploy())
@@ -17,6 +17,10 @@ class MapGraphPilot(Pilot):
   @property
   def map_context_urls(self) -> List[str]:
     return self.config['map_context_urls']
+
+  @property
+  def profile(self) -> bool:
+    return str(self.config.get('profile', False)).lower() in ('true', '1')
   
   @property
   def base_url(self) -> str:
@@ -10,7 +10,6 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
 from raspador import Maneuver, OrdnanceManeuver, NavigationManeuver, SequenceManeuver, UploadReportRaspador, ClickXPathSequenceManeuver, InteractManeuver, OrdnanceParser, XPath, RaspadorNoOrdnanceError, ClickXPathManeuver, SeekParser, SoupElementParser, FindElementManeuver, ClickSoupElementManeuver, Element, ElementManeuver, ClickElementManeuver
 from typing import Generator, Optional, Dict, List, Callable
-from time import sleep
 from bs4 import BeautifulSoup, Tag
 
 class SignInManeuver(Maneuver[RaspadorTemplatePilot]):
@@ -23,19 +22,19 @@ class SignInManeuver(Maneuver[RaspadorTemplatePilot]):
       seeker=lambda p: p.soup.find('input', {'name': 'email'})
     )
     email_element.ordnance.send_keys(pilot.email)
-    sleep(1)
+    pilot.browser.settle(timeout=1)
     email_element.ordnance.send_keys(Keys.RETURN)
-    sleep(1)
+    pilot.browser.settle(timeout=1, navigation_timeout=0.5)
 
     password_element = yield ClickElementManeuver(
       instruction='click the password field',
       seeker=lambda p: p.soup.find('input', {'name': 'password'})
     )
     password_element.ordnance.send_keys(pilot.password)
-    sleep(1)
+    pilot.browser.settle(timeout=1)
     password_element.ordnance.send_keys(Keys.RETURN)
     pilot.browser.driver.switch_to.default_content()
-    sleep(pilot.sign_in_wait)
+    pilot.browser.settle(timeout=pilot.sign_in_wait, navigation_timeout=0.5)
 
 class ClickNavigationLinkItemManeuver(Maneuver[RaspadorTemplatePilot]):
   item_text: str
@@ -52,12 +51,12 @@ class ClickNavigationLinkItemManeuver(Maneuver[RaspadorTemplatePilot]):
       seeker=lambda p: p.soup.find('a', text=self.item_text)
     )
     fly(click_manuever)
-    sleep(self.wait_after)
+    pilot.browser.settle(timeout=self.wait_after, navigation_timeout=0.5)
 
 class RaspadorTemplateManeuver(Maneuver[RaspadorTemplatePilot]):
   def attempt(self, pilot: RaspadorTemplatePilot):
     yield NavigationManeuver(url=f'file://{Path.cwd() / "bots" / "raspador_template" / "html" / "main.html"}')
-    sleep(5)
+    pilot.browser.settle(timeout=5)
 
     yield SignInManeuver()
     yield ClickNavigationLinkItemManeuver(item_text='Go', wait_after=1)
@@ -3,16 +3,25 @@ Automated scraping.
 """
 from .base import MenuOption, ControlMode, ControlAction, Ordnance, OptionalOrdnance, XPath, BrowserElement
 from .raspador import Raspador, OrdnanceRaspador, ReportRaspador, UploadReportRaspador
-from .browser_interactor import BrowserInteractor
+from .browser_interactor import BrowserInteractor, DriverLaunch, WaitEngine
+from .browser_pool import BrowserPool
 from .user_interactor import UserInteractor, Interaction
-from .error import RaspadorError, RaspadorInputTimeoutError, RaspadorDidNotCompleteManuallyError, RaspadorCannotInteractError, RaspadorManeuverRequiredError, RaspadorInvalidManeuverError, RaspadorInvalidPositionError, RaspadorInteract, RaspadorSkip, RaspadorSkipOver, RaspadorSkipUp, RaspadorSkipToBreak, RaspadorQuit, RaspadorNoOrdnanceError, RaspadorElementError
+from .error import RaspadorError, RaspadorInputTimeoutError, RaspadorDidNotCompleteManuallyError, RaspadorCannotInteractError, RaspadorManeuverRequiredError, RaspadorInvalidManeuverError, RaspadorInvalidPositionError, RaspadorInteract, RaspadorSkip, RaspadorSkipOver, RaspadorSkipUp, RaspadorSkipToBreak, RaspadorQuit, RaspadorNoOrdnanceError, RaspadorElementError, RaspadorBrowserPoolTimeoutError, RaspadorMapContextError, RaspadorMapPlanError, RaspadorMapNodeOptionError
 from .pilot import Pilot, OrdnancePilot
 from .parser import Parser, OrdnanceParser, SoupElementParser, SeekParser, Seeker, SoupSeeker, SoupIndexSeeker
 from .maneuver import Maneuver, Position, NavigationManeuver, ClickXPathManeuver, SequenceManeuver, ClickXPathSequenceManeuver, OrdnanceManeuver, BreakManeuver, InteractManeuver, InteractQueueManeuver, FindElementManeuver, ClickSoupElementManeuver, ParseOrdnanceManeuver, SeekManeuver, ScriptQueueManeuver, ScriptManeuver, ElementManeuver, ClickElementManeuver, QuitManeuver
 from .report_maneuver import ReportManeuver, SaveReportManeuver, LoadReportManeuver, ProcessReportManeuver, UploadReportManeuver, CollectReportManeuver
+from .map_class import MapClassCache
+from .map_context import MapContextCache
+from .map_plan import MapGraphPlan
+from .map_profile import MapGraphProfile
+from .map_cache import MapNodeCache
+from .map_stream import MapGraphStream
 from .map_maneuver import MapGraphsEntryManeuver, MapGraphManeuver
 from .bot_maneuver import BotManeuver
 from .style import Styling, CustomStyling, Color, Font, Format, Styled, CustomStyled, Styleds
-from .element import Element, ElementParser
+from .element import Element, ElementCollection, ElementParser
+from .flight_log import FlightLog, FlightLogStream
+from .monitor import Monitor
 
 from .explore_scraper import ExploreScraper
\ No newline at end of file
@@ -9,6 +9,7 @@ from .pilot import Pilot
 from .raspador import Raspador
 from .user_interactor import UserInteractor
 from .browser_interactor import BrowserInteractor
+from .browser_pool import BrowserPool
 from .error import RaspadorBotError
 
 class BotManeuver(OrdnanceManeuver[Pilot, Raspador]):
@@ -18,14 +19,16 @@ class BotManeuver(OrdnanceManeuver[Pilot, Raspador]):
   browser: Optional[BrowserInteractor]
   user: Optional[UserInteractor]
   clear_context: bool
+  pool_browser: bool
 
-  def __init__(self, bot_name: Optional[str]=None, configuration_name: Optional[str]='default', configuration: Dict[str, any]={}, browser: Optional[BrowserInteractor]=None, user: Optional[UserInteractor]=None, clear_context: bool=True):
+  def __init__(self, bot_name: Optional[str]=None, configuration_name: Optional[str]='default', configuration: Dict[str, any]={}, browser: Optional[BrowserInteractor]=None, user: Optional[UserInteractor]=None, clear_context: bool=True, pool_browser: bool=False):
     self.bot_name = bot_name
     self.configuration_name = configuration_name
     self.configuration = configuration
     self.browser = browser
     self.user = user
     self.clear_context = clear_context
+    self.pool_browser = pool_browser
 
     super().__init__()
 
@@ -34,27 +37,36 @@ class BotManeuver(OrdnanceManeuver[Pilot, Raspador]):
     configuration = json.loads(configuration_path.read_bytes()) if configuration_path.exists() else {}
     configuration.update(self.configuration)
     module = importlib.import_module(self.bot_name)
+    browser_pool = BrowserPool.shared_pool() if self.pool_browser and self.browser is None else None
+    browser = browser_pool.acquire() if browser_pool is not None else pilot.browser if self.browser is None else self.browser
+    error = None
     try:
       with IOMap._local_registries(clear=self.clear_context):
         bot: Raspador = module.Bot(
-          browser=pilot.browser if self.browser is None else self.browser,
+          browser=browser,
           user=self.user,
           configuration=configuration,
           interactive=pilot.user.interactive if self.user is None else None
         )
+        bot.flight_log_stream = scraper.flight_log_stream
         if self.user is None:
           self.configure_user(
             source_user=pilot.user,
             target_user=bot.user
           )
         bot.scrape()
+    except BaseException as e:
+      error = e
+      raise
     finally:
-      if self.browser is not None:
+      if browser_pool is not None:
+        browser_pool.release(browser=browser, error=error)
+      elif self.browser is not None:
         bot.browser.driver.quit()
 
     bot_log = bot.flight_logs[-2]
-    scraper.flight_logs[-1] = scraper.flight_logs[-1].append(bot_log)
-    bot_error = bot_log.iloc[-1].error
+    scraper.current_flight_log.extend(bot_log)
+    bot_error = bot_log.row(-1)['error']
     if bot_error:
       raise RaspadorBotError(
         bot=bot,
@@ -64,10 +76,14 @@ class BotManeuver(OrdnanceManeuver[Pilot, Raspador]):
 
   def configure_user(self, source_user: UserInteractor, target_user: UserInteractor):
     target_user.interactive = source_user.interactive
+    target_user.quiet = source_user.quiet
     target_user.control_mode = source_user.control_mode
     target_user.timeout = source_user.timeout
     target_user.abbreviated_length = source_user.abbreviated_length
+    target_user.detail_sample_rate = source_user.detail_sample_rate
     target_user.break_on_exceptions = source_user.break_on_exceptions
     target_user.monitor = source_user.monitor
+    target_user.monitor_frame_rate = source_user.monitor_frame_rate
+    target_user.monitor_recorder = source_user.monitor_recorder
     target_user.retry = source_user.retry
 
@@ -1,44 +1,284 @@
+from __future__ import annotations
+import io
 import os
+import time
+import shutil
 import zipfile
 
 from .base import XPath, BrowserElement
 
 from bs4 import BeautifulSoup
-from typing import Optional, List, Dict, Tuple
+from typing import Optional, List, Dict, Tuple, Union, Callable
 from enum import Enum
 from config import interactor_config, environment_config
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException, WebDriverException
+
+class CachedFirefoxProfile(webdriver.FirefoxProfile):
+  _encoded: Optional[str]=None
+
+  @classmethod
+  def from_encoded(cls, encoded: str) -> CachedFirefoxProfile:
+    profile = cls()
+    profile._encoded = encoded
+    return profile
+
+  def set_preference(self, key, value):
+    self._encoded = None
+    super().set_preference(key, value)
+
+  @property
+  def encoded(self) -> str:
+    if self._encoded is None:
+      self._encoded = super().encoded
+    return self._encoded
+
+class DriverLaunch:
+  driver: any
+  headless: bool
+  display: Optional[any]
+  timing: Dict[str, float]
+
+  def __init__(self, driver: any, headless: bool, display: Optional[any], timing: Dict[str, float]):
+    self.driver = driver
+    self.headless = headless
+    self.display = display
+    self.timing = timing
+
+class WaitEngine(Enum):
+  observer = 'observer'
+  polling = 'polling'
 
 class BrowserInteractor:
+  observe_script: str='''
+    var targets = arguments[0];
+    var timeout = arguments[1];
+    var pollInterval = arguments[2];
+    var callback = arguments[arguments.length - 1];
+    var finished = false;
+    var observer = null;
+    var timer = null;
+    var poller = null;
+    function matches(node, condition) {
+      if (!node) {
+        return false;
+      }
+      if (condition === 'present') {
+        return true;
+      }
+      var style = window.getComputedStyle(node);
+      var visible = style.visibility !== 'hidden' && style.display !== 'none' && !!(node.offsetWidth || node.offsetHeight || node.getClientRects().length);
+      return condition === 'visible' ? visible : visible && !node.disabled;
+    }
+    function finish(result) {
+      if (finished) {
+        return;
+      }
+      finished = true;
+      if (observer) {
+        observer.disconnect();
+      }
+      clearTimeout(timer);
+      clearInterval(poller);
+      callback(result);
+    }
+    function check() {
+      for (var i = 0; i < targets.length; i++) {
+        var node = document.evaluate(targets[i][0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (matches(node, targets[i][1])) {
+          finish([i, node]);
+          return;
+        }
+      }
+    }
+    check();
+    if (finished) {
+      return;
+    }
+    observer = new MutationObserver(check);
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    poller = setInterval(check, pollInterval);
+    timer = setTimeout(function() { finish(null); }, timeout);
+  '''
+  settle_script: str='''
+    var quietPeriod = arguments[0];
+    var timeout = arguments[1];
+    var callback = arguments[arguments.length - 1];
+    if (!window.__raspadorRequests) {
+      var requests = window.__raspadorRequests = {pending: 0};
+      if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function() {
+          requests.pending += 1;
+          var done = function() { requests.pending -= 1; };
+          var result = fetch.apply(this, arguments);
+          result.then(done, done);
+          return result;
+        };
+      }
+      var send = XMLHttpRequest.prototype.send;
+      XMLHttpRequest.prototype.send = function() {
+        requests.pending += 1;
+        this.addEventListener('loadend', function() { requests.pending -= 1; });
+        return send.apply(this, arguments);
+      };
+    }
+    var start = Date.now();
+    var lastMutation = start;
+    var observer = new MutationObserver(function() { lastMutation = Date.now(); });
+    observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    var timer = setInterval(function() {
+      var now = Date.now();
+      var idle = document.readyState === 'complete' && window.__raspadorRequests.pending <= 0 && now - lastMutation >= quietPeriod;
+      if (idle || now - start >= timeout) {
+        clearInterval(timer);
+        observer.disconnect();
+        callback(idle);
+      }
+    }, Math.max(Math.min(quietPeriod / 4, 50), 10));
+  '''
+  navigation_script: str='''
+    var timeout = arguments[0];
+    var callback = arguments[arguments.length - 1];
+    if (document.readyState !== 'complete') {
+      callback('loading');
+      return;
+    }
+    var finished = false;
+    var timer = null;
+    function finish(result) {
+      if (finished) {
+        return;
+      }
+      finished = true;
+      clearTimeout(timer);
+      window.removeEventListener('beforeunload', unload);
+      window.removeEventListener('pagehide', unload);
+      callback(result);
+    }
+    function unload() {
+      finish('unloading');
+    }
+    window.addEventListener('beforeunload', unload);
+    window.addEventListener('pagehide', unload);
+    timer = setTimeout(function() { finish('stayed'); }, timeout);
+  '''
+  wait_conditions: Dict[str, Callable[[Tuple[str, str]], Callable[[any], any]]]={
+    'present': expected_conditions.presence_of_element_located,
+    'visible': expected_conditions.visibility_of_element_located,
+    'clickable': expected_conditions.element_to_be_clickable,
+  }
+
   driver: any # the web driver object
   colors = ['red', 'orange']
-  display: Optional[any]
+  display: Optional[any]=None
+  headless: bool=False
+  driver_timing: Optional[Dict[str, float]]
+  snapshot_enabled: bool=True
+  wait_engine: WaitEngine=WaitEngine.polling
+  poll_frequency: float=0.5
+  wait_time: float
+  unrecorded_wait_time: float
+  user_context: Optional[str]
+  _script_timeout: Optional[float]
+  _snapshot_url: Optional[str]
+  _snapshot_source: Optional[str]
+  profile_cache: Dict[Tuple[Optional[str], Tuple[Tuple[str, any], ...]], str]={}
+
+  @classmethod
+  def download_preferences(cls) -> Dict[str, any]:
+    return {
+      'browser.download.folderList': 2,
+      'browser.download.manager.showWhenStarting': False,
+      'browser.download.dir': os.getcwd(),
+      'browser.helperApps.neverAsk.saveToDisk': 'text/csv, application/zip',
+    }
+
+  @classmethod
+  def firefox_profile(cls, profile_directory_path: Optional[str]=None, preferences: Dict[str, any]={}) -> CachedFirefoxProfile:
+    key = (profile_directory_path, tuple(sorted(preferences.items())))
+    if key not in cls.profile_cache:
+      firefox_profile = CachedFirefoxProfile(profile_directory_path)
+      for name, value in preferences.items():
+        firefox_profile.set_preference(name, value)
+      cls.profile_cache[key] = firefox_profile.encoded
+      shutil.rmtree(firefox_profile.path, ignore_errors=True)
+    # each driver gets its own profile directory, which it deletes on quit, sharing only the encoded profile
+    return CachedFirefoxProfile.from_encoded(encoded=cls.profile_cache[key])
 
   @classmethod
-  def create_driver(cls, platform=environment_config['platform'], profile_directory_path: Optional[str]=None, display_size: Optional[Tuple[int, int]]=(1024, 768)) -> any:
+  def launch_driver(cls, platform=environment_config['platform'], profile_directory_path: Optional[str]=None, display_size: Optional[Tuple[int, int]]=(1024, 768), headless: bool=environment_config.get('headless', False), browser: str=environment_config.get('browser', 'firefox')) -> DriverLaunch:
+    if headless:
+      if platform != 'docker':
+        cls._add_geckodriver_to_path()
+        if browser == 'firefox' and not profile_directory_path:
+          profile_directory_path = interactor_config['geckodriver_profile_path']
+      return cls.launch_headless_driver(browser=browser, profile_directory_path=profile_directory_path, display_size=display_size)
+    display = None
+    timing = {}
+    start_time = time.monotonic()
     if platform == 'docker':
       from pyvirtualdisplay.smartdisplay import SmartDisplay
-      cls.display = SmartDisplay(visible=0, size=display_size)
-      cls.display.start()
-      firefox_profile = webdriver.FirefoxProfile()
-      firefox_profile.set_preference('browser.download.folderList', 2)
-      firefox_profile.set_preference('browser.download.manager.showWhenStarting', False)
-      firefox_profile.set_preference('browser.download.dir', os.getcwd())
-      firefox_profile.set_preference('browser.helperApps.neverAsk.saveToDisk', 'text/csv, application/zip')
-      return webdriver.Firefox(firefox_profile=firefox_profile)
+      display = SmartDisplay(visible=0, size=display_size)
+      display.start()
+      path = None
     else:
       cls._add_geckodriver_to_path()
       path = profile_directory_path if profile_directory_path else interactor_config['geckodriver_profile_path']
-      firefox_profile = webdriver.FirefoxProfile(path)
-      firefox_profile.set_preference('browser.download.folderList', 2)
-      firefox_profile.set_preference('browser.download.manager.showWhenStarting', False)
-      firefox_profile.set_preference('browser.download.dir', os.getcwd())
-      firefox_profile.set_preference('browser.helperApps.neverAsk.saveToDisk', 'text/csv, application/zip')
-      return webdriver.Firefox(firefox_profile)
+    timing['display'] = time.monotonic() - start_time
+    firefox_profile = cls.firefox_profile(profile_directory_path=path, preferences=cls.download_preferences())
+    timing['profile'] = time.monotonic() - start_time - timing['display']
+    options = webdriver.FirefoxOptions()
+    options.set_capability('webSocketUrl', True)
+    driver = webdriver.Firefox(firefox_profile=firefox_profile, options=options)
+    timing['browser'] = time.monotonic() - start_time - timing['display'] - timing['profile']
+    timing['total'] = time.monotonic() - start_time
+    return DriverLaunch(driver=driver, headless=False, display=display, timing=timing)
+
+  @classmethod
+  def launch_headless_driver(cls, browser: str='firefox', profile_directory_path: Optional[str]=None, display_size: Optional[Tuple[int, int]]=(1024, 768)) -> DriverLaunch:
+    timing = {'display': 0.0}
+    start_time = time.monotonic()
+    if browser == 'chrome':
+      options = webdriver.ChromeOptions()
+      options.add_argument('--headless')
+      options.add_argument('--no-sandbox')
+      options.add_argument('--disable-dev-shm-usage')
+      options.set_capability('webSocketUrl', True)
+      if display_size:
+        options.add_argument(f'--window-size={display_size[0]},{display_size[1]}')
+      options.add_experimental_option('prefs', {
+        'download.default_directory': os.getcwd(),
+        'download.prompt_for_download': False,
+      })
+      timing['profile'] = time.monotonic() - start_time
+      driver = webdriver.Chrome(options=options)
+    elif browser == 'firefox':
+      options = webdriver.FirefoxOptions()
+      options.add_argument('-headless')
+      options.set_capability('webSocketUrl', True)
+      if display_size:
+        options.add_argument(f'--width={display_size[0]}')
+        options.add_argument(f'--height={display_size[1]}')
+      firefox_profile = cls.firefox_profile(profile_directory_path=profile_directory_path, preferences=cls.download_preferences())
+      timing['profile'] = time.monotonic() - start_time
+      driver = webdriver.Firefox(firefox_profile=firefox_profile, options=options)
+    else:
+      raise ValueError('Unsupported headless browser', browser)
+    timing['browser'] = time.monotonic() - start_time - timing['profile']
+    timing['total'] = time.monotonic() - start_time
+    return DriverLaunch(driver=driver, headless=True, display=None, timing=timing)
+
+  @classmethod
+  def create_driver(cls, platform=environment_config['platform'], profile_directory_path: Optional[str]=None, display_size: Optional[Tuple[int, int]]=(1024, 768), headless: bool=environment_config.get('headless', False), browser: str=environment_config.get('browser', 'firefox')) -> any:
+    return cls.launch_driver(platform=platform, profile_directory_path=profile_directory_path, display_size=display_size, headless=headless, browser=browser).driver
+
+  @classmethod
+  def create_headless_driver(cls, browser: str='firefox', profile_directory_path: Optional[str]=None, display_size: Optional[Tuple[int, int]]=(1024, 768)) -> any:
+    return cls.launch_headless_driver(browser=browser, profile_directory_path=profile_directory_path, display_size=display_size).driver
 
   @classmethod
   def _add_geckodriver_to_path(cls):
@@ -47,38 +287,152 @@ class BrowserInteractor:
       return
     os.environ['PATH'] = '{}:{}'.format(os.environ['PATH'], geckodriver_path)
 
-  def __init__(self, driver: Optional[any]=None, window_size: Optional[Tuple[int, int]]=(1024, 768)):
-    self.driver = driver if driver is not None else type(self).create_driver()
+  def __init__(self, driver: Optional[any]=None, window_size: Optional[Tuple[int, int]]=(1024, 768), launch: Optional[DriverLaunch]=None):
+    if driver is None and launch is None:
+      launch = type(self).launch_driver()
+    self.driver = driver if driver is not None else launch.driver
+    self.headless = launch.headless if launch is not None else False
+    self.display = launch.display if launch is not None else None
+    self.driver_timing = launch.timing if launch is not None else None
+    self._snapshot_url = None
+    self._snapshot_source = None
+    self.wait_time = 0.0
+    self.unrecorded_wait_time = 0.0
+    self.user_context = None
+    self._script_timeout = None
     if window_size:
       self.driver.set_window_size(*window_size)
 
   def navigate(self, url: str):
+    self.invalidate_snapshot()
     self.driver.get(url)
+
+  def open_user_context(self) -> bool:
+    # a BiDi user context has its own cookie jar and storage, so nothing from earlier contexts is reachable from it
+    if not self.driver.capabilities.get('webSocketUrl'):
+      return False
+    previous_handles = self.driver.window_handles
+    user_context = self.driver.browser.create_user_context()
+    handle = self.driver.browsing_context.create(type='tab', user_context=user_context)
+    self.driver.switch_to.window(handle)
+    for previous_handle in previous_handles:
+      self.driver.browsing_context.close(previous_handle)
+    if self.user_context is not None:
+      self.driver.browser.remove_user_context(self.user_context)
+    self.user_context = user_context
+    self.invalidate_snapshot()
+    return True
   
   def get(self, conditions: any, timeout: float=10.0) -> Optional[BrowserElement]:
-    wait = WebDriverWait(self.driver, timeout)
+    start_time = time.monotonic()
+    wait = WebDriverWait(self.driver, timeout, poll_frequency=self.poll_frequency)
     try:
       return wait.until(conditions)
     except TimeoutException:
       return None
+    finally:
+      self.invalidate_snapshot()
+      self._add_wait_time(time.monotonic() - start_time)
+
+  def observe(self, targets: List[Tuple[str, str]], timeout: float=10.0) -> Optional[Tuple[int, BrowserElement]]:
+    start_time = time.monotonic()
+    try:
+      if self._script_timeout is None or self._script_timeout < timeout + 1:
+        self._script_timeout = timeout + 1
+        self.driver.set_script_timeout(self._script_timeout)
+      result = self.driver.execute_async_script(self.observe_script, [list(t) for t in targets], int(timeout * 1000), max(int(self.poll_frequency * 1000), 10))
+      return (result[0], result[1]) if result else None
+    finally:
+      self.invalidate_snapshot()
+      self._add_wait_time(time.monotonic() - start_time)
+
+  def wait_for(self, xpath: str, condition: str='present', timeout: float=10.0) -> Optional[BrowserElement]:
+    _, element = self.wait_for_first(targets={xpath: (xpath, condition)}, timeout=timeout)
+    return element
+
+  def wait_for_first(self, targets: Dict[any, Union[str, Tuple[str, str]]], timeout: float=10.0) -> Tuple[Optional[any], Optional[BrowserElement]]:
+    keys = list(targets)
+    pairs = [(t, 'present') if isinstance(t, str) else tuple(t) for t in targets.values()]
+    if not pairs:
+      return None, None
+    if self.wait_engine is WaitEngine.observer:
+      start_time = time.monotonic()
+      try:
+        result = self.observe(targets=pairs, timeout=timeout)
+        return (keys[result[0]], result[1]) if result else (None, None)
+      except WebDriverException:
+        timeout = max(timeout - (time.monotonic() - start_time), 0)
+    conditions = [self.wait_conditions[c]((By.XPATH, x)) for x, c in pairs]
+    def first_match(driver: any) -> Union[Tuple[int, BrowserElement], bool]:
+      for index, condition in enumerate(conditions):
+        try:
+          element = condition(driver)
+        except (NoSuchElementException, StaleElementReferenceException):
+          continue
+        if element:
+          return index, element
+      return False
+    result = self.get(conditions=first_match, timeout=timeout)
+    return (keys[result[0]], result[1]) if result else (None, None)
 
   def get_existing(self, xpath: str, timeout: float = 10.0) -> Optional[BrowserElement]:
-    return self.get(
-      conditions=expected_conditions.presence_of_element_located((By.XPATH, xpath)),
-      timeout=timeout
-    )
+    return self.wait_for(xpath=xpath, condition='present', timeout=timeout)
   
   def get_visible(self, xpath: str, timeout: float = 10.0) -> Optional[BrowserElement]:
-    return self.get(
-      conditions=expected_conditions.visibility_of_element_located((By.XPATH, xpath)),
-      timeout=timeout
-    )
+    return self.wait_for(xpath=xpath, condition='visible', timeout=timeout)
 
   def get_clickable(self, xpath: str, timeout: float = 10.0) -> Optional[BrowserElement]:
-    return self.get(
-      conditions=expected_conditions.element_to_be_clickable((By.XPATH, xpath)),
-      timeout=timeout
-    )
+    return self.wait_for(xpath=xpath, condition='clickable', timeout=timeout)
+
+  def settle(self, quiet_period: float=0.25, timeout: float=5.0, navigation_timeout: float=0) -> bool:
+    start_time = time.monotonic()
+    settle_start_time = start_time
+    try:
+      if navigation_timeout > 0:
+        self.await_navigation(timeout=navigation_timeout)
+        settle_start_time = time.monotonic()
+      if self._script_timeout is None or self._script_timeout < timeout + 1:
+        self._script_timeout = timeout + 1
+        self.driver.set_script_timeout(self._script_timeout)
+      return bool(self.driver.execute_async_script(self.settle_script, int(quiet_period * 1000), int(timeout * 1000)))
+    except WebDriverException:
+      return self._settle_source(quiet_period=quiet_period, timeout=max(timeout - (time.monotonic() - settle_start_time), 0))
+    finally:
+      self.invalidate_snapshot()
+      self._add_wait_time(time.monotonic() - start_time)
+
+  def await_navigation(self, timeout: float=0.5) -> bool:
+    if self._script_timeout is None or self._script_timeout < timeout + 1:
+      self._script_timeout = timeout + 1
+      self.driver.set_script_timeout(self._script_timeout)
+    try:
+      return self.driver.execute_async_script(self.navigation_script, int(timeout * 1000)) != 'stayed'
+    except WebDriverException:
+      # the script is interrupted when its document unloads
+      return True
+
+  def _settle_source(self, quiet_period: float, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    source = None
+    stable_time = time.monotonic()
+    while True:
+      try:
+        next_source = self.driver.page_source
+      except WebDriverException:
+        next_source = None
+      if next_source is None or next_source != source:
+        source = next_source
+        stable_time = time.monotonic()
+      elif time.monotonic() - stable_time >= quiet_period:
+        return True
+      if time.monotonic() >= deadline:
+        return False
+      time.sleep(min(self.poll_frequency, quiet_period, max(deadline - time.monotonic(), 0)))
+
+  def record_wait_time(self) -> float:
+    wait_time = self.unrecorded_wait_time
+    self.unrecorded_wait_time = 0.0
+    return wait_time
 
   def element_exists(self, xpath: str) -> bool:
     try:
@@ -89,23 +443,56 @@ class BrowserInteractor:
 
   @property
   def current_url(self) -> str:
-    return self.driver.current_url
+    if not self.snapshot_enabled:
+      return self.driver.current_url
+    if self._snapshot_url is None:
+      self._snapshot_url = self.driver.current_url
+    return self._snapshot_url
 
   @property
   def current_source(self) -> str:
-    return self.driver.page_source
+    if not self.snapshot_enabled:
+      return self.driver.page_source
+    if self._snapshot_source is None:
+      self._snapshot_source = self.driver.page_source
+    return self._snapshot_source
+
+  def invalidate_snapshot(self):
+    self._snapshot_url = None
+    self._snapshot_source = None
+
+  def refresh(self) -> BrowserInteractor:
+    """Discards the cached page source and URL so that they are read from the driver again.
+    """
+    self.invalidate_snapshot()
+    return self
 
   def execute_script(self, *args, **kwargs):
+    self.invalidate_snapshot()
     return self.driver.execute_script(*args, **kwargs)
 
+  def _add_wait_time(self, wait_time: float):
+    self.wait_time += wait_time
+    self.unrecorded_wait_time += wait_time
+
   def next_color(self) -> str:
     self.colors = self.colors[1:] + self.colors[:1]
     return self.colors[-1]
 
   def create_screenshot(self) -> Optional[any]:
-    return self.display.waitgrab() if self.display else None
+    if self.display:
+      return self.display.waitgrab()
+    if self.headless:
+      from PIL import Image
+      return Image.open(io.BytesIO(self.driver.get_screenshot_as_png()))
+    return None
+
+  def create_screenshot_png(self) -> Optional[bytes]:
+    return self.driver.get_screenshot_as_png() if self.headless and not self.display else None
 
   def save_screenshot(self, path: str) -> bool:
+    if self.headless and not self.display:
+      return self.driver.get_screenshot_as_file(path)
     image = self.create_screenshot()
     if image is None:
       return False
@@ -0,0 +1,137 @@
+import threading
+
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Callable
+from .browser_interactor import BrowserInteractor
+from .error import RaspadorBrowserPoolTimeoutError
+
+class BrowserPool:
+  shared: Optional['BrowserPool']=None
+
+  max_browsers: int
+  max_uses: int
+  timeout: Optional[float]
+  browser_factory: Callable[[], BrowserInteractor]
+  _idle: List[BrowserInteractor]
+  _uses: Dict[int, int]
+  _browser_count: int
+  _condition: threading.Condition
+
+  @classmethod
+  def shared_pool(cls) -> 'BrowserPool':
+    if cls.shared is None:
+      cls.shared = cls()
+    return cls.shared
+
+  @classmethod
+  def close_shared(cls):
+    if cls.shared is None:
+      return
+    cls.shared.close()
+    cls.shared = None
+
+  def __init__(self, max_browsers: int=2, max_uses: int=20, timeout: Optional[float]=None, browser_factory: Optional[Callable[[], BrowserInteractor]]=None):
+    self.max_browsers = max_browsers
+    self.max_uses = max_uses
+    self.timeout = timeout
+    self.browser_factory = browser_factory if browser_factory is not None else BrowserInteractor
+    self._idle = []
+    self._uses = {}
+    self._browser_count = 0
+    self._condition = threading.Condition()
+
+  @property
+  def idle_count(self) -> int:
+    return len(self._idle)
+
+  @property
+  def browser_count(self) -> int:
+    return self._browser_count
+
+  def warm(self, count: int=1):
+    with self._condition:
+      count = min(count, self.max_browsers - self._browser_count)
+      self._browser_count += max(count, 0)
+    for _ in range(count):
+      browser = self._create_browser()
+      with self._condition:
+        self._idle.append(browser)
+        self._condition.notify()
+
+  def acquire(self, fresh: bool=False) -> BrowserInteractor:
+    with self._condition:
+      while True:
+        if self._idle and not fresh:
+          return self._idle.pop()
+        if self._browser_count < self.max_browsers:
+          self._browser_count += 1
+          break
+        if self._idle:
+          self._discard(self._idle.pop(0))
+          continue
+        if not self._condition.wait(timeout=self.timeout):
+          raise RaspadorBrowserPoolTimeoutError(pool=self)
+    return self._create_browser()
+
+  def release(self, browser: BrowserInteractor, error: Optional[Exception]=None):
+    with self._condition:
+      self._uses[id(browser)] = self._uses.get(id(browser), 0) + 1
+      uses = self._uses[id(browser)]
+    if error is None and uses < self.max_uses:
+      try:
+        if self.reset(browser=browser):
+          with self._condition:
+            self._idle.append(browser)
+            self._condition.notify()
+          return
+      except (SystemExit, KeyboardInterrupt):
+        raise
+      except Exception:
+        pass
+    with self._condition:
+      self._discard(browser)
+      self._condition.notify()
+
+  @contextmanager
+  def browser(self, fresh: bool=False):
+    browser = self.acquire(fresh=fresh)
+    error = None
+    try:
+      yield browser
+    except BaseException as e:
+      error = e
+      raise
+    finally:
+      self.release(browser=browser, error=error)
+
+  def reset(self, browser: BrowserInteractor) -> bool:
+    # clearing cookies and storage origin by origin misses origins reached through clicks and redirects, so only a fresh user context counts as a reset
+    browser.driver.delete_all_cookies()
+    if not browser.open_user_context():
+      return False
+    browser.navigate('about:blank')
+    return True
+
+  def close(self):
+    with self._condition:
+      while self._idle:
+        self._discard(self._idle.pop())
+
+  def _create_browser(self) -> BrowserInteractor:
+    try:
+      return self.browser_factory()
+    except BaseException:
+      with self._condition:
+        self._browser_count -= 1
+        self._condition.notify()
+      raise
+
+  def _discard(self, browser: BrowserInteractor):
+    self._browser_count -= 1
+    self._uses.pop(id(browser), None)
+    try:
+      browser.driver.quit()
+    except (SystemExit, KeyboardInterrupt):
+      raise
+    except Exception:
+      pass
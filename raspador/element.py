@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Optional
+from typing import Optional, List, Dict
 from .base import XPath, BrowserElement
 from .error import RaspadorElementError
 from .browser_interactor import BrowserInteractor
@@ -26,6 +26,14 @@ class Element:
   parser: Parser
   timeout: float
 
+  @classmethod
+  def from_soup_elements(cls, soup_elements: List[PageElement], parser: Parser, parent_xpath: Optional[XPath]=None, browser: Optional[BrowserInteractor]=None, timeout: float=5.0) -> List[Element]:
+    xpaths = parser.xpaths_for_elements(elements=soup_elements)
+    return [
+      cls(xpath=x, parent_xpath=parent_xpath, soup_element=e, browser=browser, parser=parser, timeout=timeout)
+      for x, e in zip(xpaths, soup_elements)
+    ]
+
   def __init__(self, xpath: Optional[XPath]=None, parent_xpath: Optional[XPath]=None, parent: Optional[Element]=None, element: Optional[BrowserElement]=None, soup_element: Optional[PageElement]=None, browser: Optional[BrowserInteractor]=None, parser: Optional[Parser]=None, timeout: float=5.0):
     if parent is not None:
       if parent_xpath is None:
@@ -91,6 +99,7 @@ class Element:
   def click(self):
     if self.element is None:
       self.load_clickable()
+    self.browser.invalidate_snapshot()
     self.element.click()
     return self
 
@@ -98,6 +107,7 @@ class Element:
   def send_keys(self, *value):
     if self.element is None:
       self.load_existing()
+    self.browser.invalidate_snapshot()
     self.element.send_keys(*value)
     return self
 
@@ -139,5 +149,144 @@ class Element:
     css_rules = dict([[value.strip() for value in entry.split(':')] for entry in css_entries])
     return css_rules
 
+class ElementCollection:
+  resolve_script: str='''
+    return arguments[0].map(function(xpath) {
+      return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    });
+  '''
+  read_script: str='''
+    var attributes = arguments[1];
+    var styles = arguments[2];
+    return arguments[0].map(function(xpath) {
+      var node = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+      if (!node) {
+        return null;
+      }
+      var computed = styles.length ? window.getComputedStyle(node) : null;
+      var result = {text: node.innerText !== undefined ? node.innerText : node.textContent, attributes: {}, styles: {}};
+      attributes.forEach(function(name) { result.attributes[name] = node.getAttribute(name); });
+      styles.forEach(function(name) { result.styles[name] = computed.getPropertyValue(name); });
+      return result;
+    });
+  '''
+  apply_script: str='''
+    var operation = arguments[1];
+    var name = arguments[2];
+    var values = arguments[3];
+    var count = 0;
+    arguments[0].forEach(function(xpath, index) {
+      var node = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+      if (!node) {
+        return;
+      }
+      var value = values[index % values.length];
+      if (operation === 'add_class') {
+        node.classList.add(name);
+      } else if (operation === 'remove_class') {
+        node.classList.remove(name);
+      } else if (operation === 'style') {
+        node.style[name] = value;
+      }
+      count += 1;
+    });
+    return count;
+  '''
+
+  xpaths: List[XPath]
+  elements: Optional[List[Optional[BrowserElement]]]
+  soup_elements: Optional[List[PageElement]]
+  browser: BrowserInteractor
+  parser: Optional[Parser]
+  timeout: float
+
+  @classmethod
+  def from_soup_elements(cls, soup_elements: List[PageElement], parser: Parser, browser: BrowserInteractor, parent_xpath: Optional[XPath]=None, timeout: float=5.0) -> ElementCollection:
+    xpaths = parser.xpaths_for_elements(elements=soup_elements)
+    if parent_xpath is not None:
+      xpaths = [f'{parent_xpath}/{x}' for x in xpaths]
+    return cls(xpaths=xpaths, browser=browser, soup_elements=soup_elements, parser=parser, timeout=timeout)
+
+  def __init__(self, xpaths: List[XPath], browser: BrowserInteractor, soup_elements: Optional[List[PageElement]]=None, parser: Optional[Parser]=None, timeout: float=5.0):
+    self.xpaths = [*xpaths]
+    self.browser = browser
+    self.soup_elements = soup_elements
+    self.parser = parser
+    self.timeout = timeout
+    self.elements = None
+
+  @property
+  def xpath(self) -> XPath:
+    return ' | '.join(self.xpaths)
+
+  def __len__(self) -> int:
+    return len(self.xpaths)
+
+  def __getitem__(self, index: int) -> Element:
+    if self.elements is None:
+      self.load_existing()
+    return Element(
+      xpath=self.xpaths[index],
+      element=self.elements[index],
+      soup_element=self.soup_elements[index] if self.soup_elements is not None else None,
+      browser=self.browser,
+      parser=self.parser,
+      timeout=self.timeout
+    )
+
+  def __iter__(self):
+    return (self[i] for i in range(len(self)))
+
+  @handle_element_error
+  def load_existing(self, timeout: Optional[float]=None) -> ElementCollection:
+    timeout = timeout if timeout is not None else self.timeout
+    def resolve(driver: any) -> Optional[List[BrowserElement]]:
+      elements = driver.execute_script(self.resolve_script, self.xpaths)
+      return elements if all(e is not None for e in elements) else None
+    self.elements = self.browser.get(conditions=resolve, timeout=timeout) if timeout > 0 else None
+    if self.elements is None:
+      self.elements = self.browser.driver.execute_script(self.resolve_script, self.xpaths)
+    return self
+
+  @handle_element_error
+  def expire(self) -> ElementCollection:
+    self.elements = None
+    return self
+
+  @handle_element_error
+  def read(self, attributes: List[str]=[], styles: List[str]=[]) -> List[Optional[Dict[str, any]]]:
+    return self.browser.driver.execute_script(self.read_script, self.xpaths, attributes, styles)
+
+  @handle_element_error
+  def texts(self) -> List[Optional[str]]:
+    return [r['text'] if r is not None else None for r in self.read()]
+
+  @handle_element_error
+  def add_class(self, value: str) -> ElementCollection:
+    self._apply(operation='add_class', name=value)
+    return self
+
+  @handle_element_error
+  def remove_class(self, value: str) -> ElementCollection:
+    self._apply(operation='remove_class', name=value)
+    return self
+
+  @handle_element_error
+  def set_css_property(self, prop: str, value: str) -> ElementCollection:
+    self._apply(operation='style', name=prop, values=[value])
+    return self
+
+  @handle_element_error
+  def highlight(self) -> ElementCollection:
+    if not Element.highlight_enabled:
+      return self
+    self._apply(operation='style', name='background', values=[self.browser.next_color() for _ in self.xpaths])
+    return self
+
+  def _apply(self, operation: str, name: str, values: List[str]=['']) -> int:
+    if not self.xpaths:
+      return 0
+    return self.browser.execute_script(self.apply_script, self.xpaths, operation, name, values)
+
 class ElementParser(SeekParser[Element]):
   pass
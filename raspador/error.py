@@ -59,3 +59,19 @@ class RaspadorUnexpectedResultsError(RaspadorError):
 class RaspadorBotError(RaspadorError):
   def __init__(self, bot: 'Raspador', bot_error: str):
     super().__init__(f'Bot scrape failed for {bot.name} with error {bot_error}')
+
+class RaspadorBrowserPoolTimeoutError(RaspadorError):
+  def __init__(self, pool: 'BrowserPool'):
+    super().__init__(f'Timed out after {pool.timeout} seconds waiting for one of {pool.max_browsers} pooled browsers')
+
+class RaspadorMapContextError(RaspadorError):
+  def __init__(self, url: str, error: Exception):
+    super().__init__(f'Could not load map context from {url}: {error}')
+
+class RaspadorMapPlanError(RaspadorError):
+  def __init__(self, reference: str, message: str):
+    super().__init__(f'Could not compile map graph plan at {reference}: {message}')
+
+class RaspadorMapNodeOptionError(RaspadorError):
+  def __init__(self, path: str, message: str):
+    super().__init__(f'Invalid options for map graph node {path}: {message}')
@@ -0,0 +1,214 @@
+import os
+import json
+import queue
+import threading
+import time
+import pandas as pd
+
+from typing import Optional, List, Dict, Union, Tuple
+
+class FlightLog:
+  columns: List[str]=[
+    'entry_time',
+    'stable_time',
+    'raspador',
+    'pilot',
+    'mission',
+    'maneuver',
+    'option',
+    'error',
+    'detail',
+    'result',
+    'instruction',
+    'id',
+    'maneuver_id',
+    'mission_id',
+    'wait_time',
+  ]
+
+  column_values: Dict[str, List[any]]
+  maneuver_counts: Dict[Tuple[str, str, str], int]
+  error_counts: Dict[Tuple[str, str], int]
+  _data_frame: Optional[pd.DataFrame]
+
+  @classmethod
+  def from_data_frame(cls, data_frame: pd.DataFrame) -> 'FlightLog':
+    flight_log = cls()
+    flight_log.extend(data_frame)
+    return flight_log
+
+  def __init__(self):
+    self.column_values = {c: [] for c in self.columns}
+    self.maneuver_counts = {}
+    self.error_counts = {}
+    self._data_frame = None
+
+  def __len__(self) -> int:
+    return len(self.column_values[self.columns[0]])
+
+  @property
+  def empty(self) -> bool:
+    return len(self) == 0
+
+  @property
+  def data_frame(self) -> pd.DataFrame:
+    if self._data_frame is None:
+      self._data_frame = pd.DataFrame(self.column_values, columns=self.columns) if not self.empty else pd.DataFrame()
+    return self._data_frame
+
+  @property
+  def results(self) -> List[str]:
+    return sorted({k[2] for k in self.maneuver_counts})
+
+  @property
+  def top_maneuvers_report(self) -> pd.Series:
+    return self._count_report(counts=self.maneuver_counts, names=['maneuver', 'option', 'result'])
+
+  @property
+  def top_errors_report(self) -> pd.Series:
+    return self._count_report(counts=self.error_counts, names=['error', 'maneuver'])
+
+  def row(self, index: int) -> Dict[str, any]:
+    return {c: self.column_values[c][index] for c in self.columns}
+
+  def append(self, row: Dict[str, any]):
+    for column in self.columns:
+      self.column_values[column].append(row.get(column, ''))
+    self._count(start=len(self) - 1)
+    self._data_frame = None
+
+  def extend(self, flight_log: Union['FlightLog', pd.DataFrame]):
+    if flight_log.empty:
+      return
+    start = len(self)
+    for column in self.columns:
+      if isinstance(flight_log, FlightLog):
+        values = flight_log.column_values[column]
+      else:
+        values = flight_log[column].tolist() if column in flight_log.columns else [''] * len(flight_log)
+      self.column_values[column].extend(values)
+    self._count(start=start)
+    self._data_frame = None
+
+  def _count(self, start: int):
+    maneuvers = self.column_values['maneuver'][start:]
+    options = self.column_values['option'][start:]
+    results = self.column_values['result'][start:]
+    errors = self.column_values['error'][start:]
+    for maneuver, option, result, error in zip(maneuvers, options, results, errors):
+      maneuver_key = (maneuver, option, result)
+      self.maneuver_counts[maneuver_key] = self.maneuver_counts.get(maneuver_key, 0) + 1
+      if error != '':
+        error_key = (error, maneuver)
+        self.error_counts[error_key] = self.error_counts.get(error_key, 0) + 1
+
+  def _count_report(self, counts: Dict[Tuple[str, ...], int], names: List[str]) -> pd.Series:
+    keys = sorted(counts)
+    index = pd.MultiIndex.from_tuples(keys, names=names) if keys else pd.MultiIndex.from_arrays([[]] * len(names), names=names)
+    return pd.Series([counts[k] for k in keys], index=index, dtype='int64')
+
+class FlightLogStream:
+  directory: str
+  file_name: str
+  batch_size: int
+  flush_interval: float
+  max_file_size: int
+  file_index: int
+  _queue: queue.Queue
+  _thread: Optional[threading.Thread]
+  error: Optional[Exception]
+  _closed: bool
+
+  @classmethod
+  def load(cls, paths: List[str]) -> pd.DataFrame:
+    data_frames = [pd.read_json(p, lines=True, dtype=False) for p in paths if os.path.getsize(p)]
+    return pd.concat(data_frames, ignore_index=True) if data_frames else pd.DataFrame()
+
+  def __init__(self, file_name: str, directory: Optional[str]=None, batch_size: int=100, flush_interval: float=1.0, max_file_size: int=64 * 1024 * 1024, max_queue_size: int=10000):
+    self.directory = directory if directory is not None else os.path.join('output', 'log')
+    self.file_name = file_name
+    self.batch_size = batch_size
+    self.flush_interval = flush_interval
+    self.max_file_size = max_file_size
+    self.file_index = 0
+    self._queue = queue.Queue(maxsize=max_queue_size)
+    self._thread = None
+    self.error = None
+    self._closed = False
+
+  @property
+  def path(self) -> str:
+    return os.path.join(self.directory, f'{self.file_name}.{self.file_index:04d}.ndjson')
+
+  @property
+  def paths(self) -> List[str]:
+    paths = [os.path.join(self.directory, f'{self.file_name}.{i:04d}.ndjson') for i in range(self.file_index + 1)]
+    return [p for p in paths if os.path.exists(p)]
+
+  def write(self, row: Dict[str, any]):
+    if self.error is not None:
+      raise self.error
+    if self._closed:
+      return
+    if self._thread is None:
+      self._thread = threading.Thread(target=self._run, name=f'{type(self).__name__}:{self.file_name}', daemon=True)
+      self._thread.start()
+    self._queue.put(row)
+
+  def write_log(self, flight_log: FlightLog):
+    for index in range(len(flight_log)):
+      self.write(flight_log.row(index))
+
+  def flush(self):
+    if self._thread is not None:
+      self._queue.join()
+    if self.error is not None:
+      raise self.error
+
+  def close(self):
+    if self._closed:
+      return
+    self._closed = True
+    if self._thread is not None:
+      self._queue.put(None)
+      self._thread.join()
+      self._thread = None
+    if self.error is not None:
+      raise self.error
+
+  def _run(self):
+    batch = []
+    finished = False
+    deadline = None
+    while not finished:
+      timeout = self.flush_interval if deadline is None else max(deadline - time.monotonic(), 0)
+      try:
+        row = self._queue.get(timeout=timeout)
+        if row is None:
+          finished = True
+        else:
+          batch.append(row)
+          if deadline is None:
+            deadline = time.monotonic() + self.flush_interval
+        if not finished and len(batch) < self.batch_size and time.monotonic() < deadline:
+          continue
+      except queue.Empty:
+        pass
+      if self.error is None:
+        try:
+          self._write_batch(batch=batch)
+        except OSError as e:
+          self.error = e
+      for _ in range(len(batch) + (1 if finished else 0)):
+        self._queue.task_done()
+      batch = []
+      deadline = None
+
+  def _write_batch(self, batch: List[Dict[str, any]]):
+    if not batch:
+      return
+    lines = ''.join(f'{json.dumps(r, default=str)}\n' for r in batch)
+    with open(self.path, 'a') as f:
+      f.write(lines)
+    if os.path.getsize(self.path) >= self.max_file_size:
+      self.file_index += 1
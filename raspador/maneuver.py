@@ -5,7 +5,7 @@ from .user_interactor import Interaction
 from .pilot import Pilot
 from .style import Format, Styled, CustomStyled
 from .parser import SoupElementParser, OrdnanceParser, SeekParser
-from typing import Optional, List, Generator, TypeVar, Generic, Union, Callable, Dict
+from typing import Optional, List, Generator, TypeVar, Generic, Union, Callable, Dict, Tuple
 from enum import Enum
 from datetime import datetime
 from time import sleep
@@ -42,6 +42,56 @@ class Position:
     self.stable_time = datetime.utcnow()
     return self
 
+class Summary:
+  text: str
+
+  @classmethod
+  def summarized(cls, value: any, length: int) -> any:
+    if length < 0:
+      return value
+    summary, _ = cls.budgeted(value=value, length=length, budget=length)
+    return summary
+
+  @classmethod
+  def budgeted(cls, value: any, length: int, budget: int) -> Tuple[any, int]:
+    if value is None or isinstance(value, (bool, int, float, Enum)):
+      return value, budget - len(str(value))
+    if budget <= 0:
+      return cls(text='...'), 0
+    if isinstance(value, str):
+      return (value, budget - len(value)) if len(value) <= budget else (f'{value[:budget]}...', 0)
+    if isinstance(value, PageElement):
+      summary = cls(text=f'<{type(value).__name__} name={getattr(value, "name", None)}>')
+      return summary, budget - len(summary.text)
+    if hasattr(value, 'shape'):
+      summary = cls(text=f'<{type(value).__name__} shape={value.shape}>')
+      return summary, budget - len(summary.text)
+    if isinstance(value, (dict, list, tuple, set)):
+      if len(value) > max(length // 8, 1):
+        summary = cls(text=f'<{type(value).__name__} len={len(value)}>')
+        return summary, budget - len(summary.text)
+      if isinstance(value, dict):
+        items = {}
+        for k, v in value.items():
+          items[k], budget = cls.budgeted(value=v, length=length, budget=budget - len(str(k)))
+        return items, budget
+      items = []
+      for v in value:
+        item, budget = cls.budgeted(value=v, length=length, budget=budget)
+        items.append(item)
+      return type(value)(items), budget
+    text = repr(value)
+    if len(text) <= budget:
+      return value, budget - len(text)
+    summary = cls(text=f'<{type(value).__name__} {text[:budget]}...>')
+    return summary, 0
+
+  def __init__(self, text: str):
+    self.text = text
+
+  def __repr__(self) -> str:
+    return self.text
+
 P = TypeVar(Pilot)
 class Maneuver(Generic[P], IOMap):
   class Status(Enum):
@@ -58,6 +108,7 @@ class Maneuver(Generic[P], IOMap):
 
   id: UUID
   trajectory: List[Position]
+  representation_length: int=-1
 
   def __init__(self):
     self.id = UUID()
@@ -122,7 +173,7 @@ class Maneuver(Generic[P], IOMap):
     representation = {
       **({Maneuver.RepresentationKey.error.name: repr(self.position.error)} if self.position is not None and self.position.error is not None else {}),
       Maneuver.RepresentationKey.map.name: self.get_populated_map(depth=0),
-      Maneuver.RepresentationKey.operation.name: self.instruction,
+      Maneuver.RepresentationKey.operation.name: self.instruction_text(length=self.representation_length),
     }
     return representation
 
@@ -147,22 +198,40 @@ class Maneuver(Generic[P], IOMap):
     fly(self)
     self.clear_run()
 
-  def __str__(self):
+  def representation_text(self, length: int=-1) -> str:
     try:
-      representation = {**self.representation}
+      self.representation_length = length
+      try:
+        representation = {**self.representation}
+      finally:
+        del self.representation_length
       components = {}
+      budget = length
       for key in Maneuver.RepresentationKey:
         if key.name in representation:
-          components[key.name] = representation[key.name]
+          components[key.name], budget = (representation[key.name], budget) if length < 0 else Summary.budgeted(value=representation[key.name], length=length, budget=budget)
           del representation[key.name]
       for name, value in representation.items():
-        components[name] = value
+        components[name], budget = (value, budget) if length < 0 else Summary.budgeted(value=value, length=length, budget=budget)
       return f'{pformat(components, indent=2, width=80)} {self.__repr__()}'
     except (SystemExit, KeyboardInterrupt):
       raise
     except Exception:
       return super().__str__()
 
+  def instruction_text(self, length: int=-1) -> str:
+    if length < 0 or type(self).instruction is not Maneuver.instruction:
+      return self.instruction
+    try:
+      return f'perform {self.name} {Summary.summarized(value=self.get_populated_map(depth=0), length=length)!r}'
+    except (SystemExit, KeyboardInterrupt):
+      raise
+    except Exception:
+      return f'perform {self.name}'
+
+  def __str__(self):
+    return self.representation_text()
+
   def __repr__(self):
     return super().__repr__()
 
@@ -217,10 +286,14 @@ class SequenceManeuver(Generic[P], Maneuver[P]):
   index: int = 0
   sequence: List[Maneuver]
   pause_interval: float
+  settle_timeout: Optional[float]
+  navigation_timeout: float
 
-  def __init__(self, sequence: List[Maneuver]=[], pause_interval: float=0):
+  def __init__(self, sequence: List[Maneuver]=[], pause_interval: float=0, settle_timeout: Optional[float]=None, navigation_timeout: float=0):
     self.sequence = [*sequence]
     self.pause_interval = pause_interval
+    self.settle_timeout = settle_timeout
+    self.navigation_timeout = navigation_timeout
     super().__init__()
 
   @property
@@ -244,6 +317,12 @@ class SequenceManeuver(Generic[P], Maneuver[P]):
   def maneuver_is_required(self, index: int, maneuver: Maneuver) -> bool:
     return True
 
+  def pause(self, pilot: P):
+    if self.settle_timeout is not None:
+      pilot.browser.settle(timeout=self.settle_timeout, navigation_timeout=self.navigation_timeout)
+    else:
+      sleep(self.pause_interval)
+
   def attempt(self, pilot: P) -> Optional[Generator[Optional[Maneuver], Maneuver, Optional[Maneuver]]]:
     self.index = 0
     while self.index < len(self.sequence):
@@ -251,16 +330,17 @@ class SequenceManeuver(Generic[P], Maneuver[P]):
       if self.maneuver_is_required(index=self.index, maneuver=maneuver):
         self.require(maneuver)
       self.index += 1
-      sleep(self.pause_interval)
+      if self.index < len(self.sequence):
+        self.pause(pilot=pilot)
 
 class ClickXPathSequenceManeuver(Generic[P], SequenceManeuver[P]):
   xpaths: List[XPath]
 
-  def __init__(self, xpaths: List[XPath], pause_interval: float=2.0):
+  def __init__(self, xpaths: List[XPath], pause_interval: float=2.0, settle_timeout: Optional[float]=None, navigation_timeout: float=0):
     self.xpaths = xpaths
 
     sequence = [ClickXPathManeuver(xpath=x) for x in xpaths]
-    super().__init__(sequence=sequence, pause_interval=pause_interval)
+    super().__init__(sequence=sequence, pause_interval=pause_interval, settle_timeout=settle_timeout, navigation_timeout=navigation_timeout)
 
 class BreakManeuver(Generic[P], Maneuver[P]):
   maneuver: Maneuver
@@ -341,8 +421,8 @@ class ParseOrdnanceManeuver(Generic[P, O], OrdnanceManeuver[P, O]):
 class SeekManeuver(Generic[P, O], ParseOrdnanceManeuver[P, O]):
   parser: SeekParser[O]
 
-  def __init__(self, instruction: str, seeker: Callable[[BeautifulSoup, SeekParser, ...], O], source: Optional[str]=None, url: Optional[str]=None, seek: Dict[str, any]={}):
-    parser = SeekParser(instruction=instruction, seeker=seeker, source=source, url=url, seek=seek)
+  def __init__(self, instruction: str, seeker: Callable[[BeautifulSoup, SeekParser, ...], O], source: Optional[str]=None, url: Optional[str]=None, seek: Dict[str, any]={}, features: Optional[str]=None):
+    parser = SeekParser(instruction=instruction, seeker=seeker, source=source, url=url, seek=seek, features=features)
     super().__init__(parser=parser)
 
   def attempt(self, pilot: P) -> Optional[Generator[Optional[Maneuver], Maneuver, Optional[Maneuver]]]:
@@ -397,13 +477,14 @@ class ElementManeuver(Generic[P], OrdnanceManeuver[P, Element]):
   timeout: Optional[float]
   _instruction: str
 
-  def __init__(self, instruction: str, seeker: Optional[Callable[[BeautifulSoup, SeekParser, ...], PageElement]]=None, source: Optional[str]=None, url: Optional[str]=None, xpath: Optional[XPath]=None, parent_xpath: Optional[XPath]=None, parent: Optional[Element]=None, timeout: Optional[float]=None, seek: Optional[Dict[str, any]]=None, element: Optional[Element]=None):
+  def __init__(self, instruction: str, seeker: Optional[Callable[[BeautifulSoup, SeekParser, ...], PageElement]]=None, source: Optional[str]=None, url: Optional[str]=None, xpath: Optional[XPath]=None, parent_xpath: Optional[XPath]=None, parent: Optional[Element]=None, timeout: Optional[float]=None, seek: Optional[Dict[str, any]]=None, element: Optional[Element]=None, features: Optional[str]=None):
     self.seek_maneuver = SeekManeuver[P, PageElement](
       instruction=instruction, 
       seeker=seeker, 
       source=source, 
       url=url,
-      seek=seek
+      seek=seek,
+      features=features
     ) if seeker is not None or seek is not None else None
     self.xpath = xpath
     self.parent_xpath = parent_xpath
@@ -0,0 +1,87 @@
+import os
+import time
+import pickle
+import threading
+
+from typing import Optional, Dict, Tuple
+
+class MapNodeCache:
+  active: Optional['MapNodeCache']=None
+
+  directory: str
+  max_size: int
+  hit_count: int
+  miss_count: int
+  _values: Dict[str, any]
+  _lock: threading.Lock
+
+  def __init__(self, directory: Optional[str]=None, max_size: int=256 * 1024 * 1024):
+    self.directory = directory if directory is not None else os.path.join('output', 'cache')
+    self.max_size = max_size
+    self.hit_count = 0
+    self.miss_count = 0
+    self._values = {}
+    self._lock = threading.Lock()
+
+  def __len__(self) -> int:
+    return len(self._values)
+
+  def path(self, key: str) -> str:
+    return os.path.join(self.directory, f'{key}.pickle')
+
+  def get(self, key: str, ttl: Optional[float]=None) -> Tuple[bool, Optional[any]]:
+    with self._lock:
+      if key in self._values:
+        self.hit_count += 1
+        return True, self._values[key]
+    if ttl is not None:
+      path = self.path(key)
+      try:
+        if time.time() - os.path.getmtime(path) <= ttl:
+          with open(path, 'rb') as f:
+            value = pickle.load(f)
+          with self._lock:
+            self._values[key] = value
+            self.hit_count += 1
+          return True, value
+      except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        pass
+    with self._lock:
+      self.miss_count += 1
+    return False, None
+
+  def put(self, key: str, value: any, ttl: Optional[float]=None):
+    with self._lock:
+      self._values[key] = value
+    if ttl is None:
+      return
+    path = self.path(key)
+    try:
+      os.makedirs(self.directory, exist_ok=True)
+      with open(f'{path}.tmp', 'wb') as f:
+        pickle.dump(value, f)
+      os.replace(f'{path}.tmp', path)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError):
+      if os.path.exists(f'{path}.tmp'):
+        os.remove(f'{path}.tmp')
+      return
+    self.evict()
+
+  def evict(self):
+    try:
+      entries = [e for e in os.scandir(self.directory) if e.name.endswith('.pickle')]
+      stats = sorted(((e.stat().st_mtime, e.stat().st_size, e.path) for e in entries), reverse=True)
+    except OSError:
+      return
+    total_size = 0
+    for _, size, path in stats:
+      total_size += size
+      if total_size > self.max_size:
+        try:
+          os.remove(path)
+        except OSError:
+          pass
+
+  def clear(self):
+    with self._lock:
+      self._values.clear()
@@ -0,0 +1,40 @@
+import importlib
+import threading
+
+from typing import Optional, Dict
+
+class MapClassCache:
+  map_prefix: str='iomap.'
+  hit_count: int=0
+  miss_count: int=0
+  _classes: Dict[str, Optional[type]]={}
+  _lock: threading.RLock=threading.RLock()
+
+  @classmethod
+  def resolve(cls, map_path: str) -> Optional[type]:
+    with cls._lock:
+      if map_path in cls._classes:
+        cls.hit_count += 1
+        return cls._classes[map_path]
+      cls.miss_count += 1
+      map_class = None
+      if map_path.startswith(cls.map_prefix) and '/' in map_path:
+        module_name, class_name = map_path[len(cls.map_prefix):].split('/', 1)
+        try:
+          map_class = getattr(importlib.import_module(module_name), class_name)
+        except (ImportError, AttributeError):
+          pass
+      cls._classes[map_path] = map_class
+      return map_class
+
+  @classmethod
+  def invalidate(cls, map_path: str):
+    with cls._lock:
+      cls._classes.pop(map_path, None)
+
+  @classmethod
+  def clear(cls):
+    with cls._lock:
+      cls._classes.clear()
+      cls.hit_count = 0
+      cls.miss_count = 0
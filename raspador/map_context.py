@@ -0,0 +1,109 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from jsoncomment import JsonComment
+from typing import Optional, Dict, List, Tuple, Callable, Union
+from data_layer import locator_factory
+from .error import RaspadorMapContextError
+
+class MapContextCache:
+  shared: Optional['MapContextCache']=None
+
+  max_workers: int
+  remote_ttl: float
+  fetch: Callable[[str], Union[str, bytes]]
+  hit_count: int
+  miss_count: int
+  _entries: Dict[Tuple[str, bool], Tuple[Optional[Tuple[int, int]], str, Dict[str, any], float]]
+  _lock: threading.Lock
+
+  @classmethod
+  def shared_cache(cls) -> 'MapContextCache':
+    if cls.shared is None:
+      cls.shared = cls()
+    return cls.shared
+
+  @classmethod
+  def fetch_url(cls, url: str) -> Union[str, bytes]:
+    return locator_factory(url=url).get()
+
+  @classmethod
+  def local_path(cls, url: str) -> Optional[str]:
+    parsed = urlparse(url)
+    if parsed.scheme == 'file':
+      return parsed.path
+    return url if not parsed.scheme else None
+
+  def __init__(self, max_workers: int=4, remote_ttl: float=300.0, fetch: Optional[Callable[[str], Union[str, bytes]]]=None):
+    self.max_workers = max_workers
+    self.remote_ttl = remote_ttl
+    self.fetch = fetch if fetch is not None else type(self).fetch_url
+    self.hit_count = 0
+    self.miss_count = 0
+    self._entries = {}
+    self._lock = threading.Lock()
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  def load(self, urls: List[str], strict_json: bool=False) -> List[Dict[str, any]]:
+    if len(urls) < 2 or self.max_workers < 2:
+      return [self.get(url=u, strict_json=strict_json) for u in urls]
+    with ThreadPoolExecutor(max_workers=min(self.max_workers, len(urls))) as executor:
+      return list(executor.map(lambda u: self.get(url=u, strict_json=strict_json), urls))
+
+  def get(self, url: str, strict_json: bool=False) -> Dict[str, any]:
+    # the returned dict is new but the graphs in it are shared with the cache and must be treated as read-only
+    key = (url, strict_json)
+    path = type(self).local_path(url)
+    stat = None
+    if path is not None and os.path.exists(path):
+      stat_result = os.stat(path)
+      stat = (stat_result.st_mtime_ns, stat_result.st_size)
+    with self._lock:
+      entry = self._entries.get(key)
+    if entry is not None and stat is not None and entry[0] == stat:
+      return self._hit(graphs=entry[2])
+    # files are revalidated by their stat on every get, remote urls only once their copy is older than remote_ttl
+    if entry is not None and path is None and time.monotonic() - entry[3] < self.remote_ttl:
+      return self._hit(graphs=entry[2])
+    try:
+      contents = self.fetch(url)
+    except (SystemExit, KeyboardInterrupt):
+      raise
+    except Exception as e:
+      raise RaspadorMapContextError(url=url, error=e)
+    if isinstance(contents, str):
+      contents = contents.encode()
+    digest = hashlib.sha1(contents).hexdigest()
+    if entry is not None and entry[1] == digest:
+      with self._lock:
+        self._entries[key] = (stat, digest, entry[2], time.monotonic())
+      return self._hit(graphs=entry[2])
+    try:
+      text = contents.decode()
+      graphs = json.loads(text) if strict_json else JsonComment().loads(text)
+    except (SystemExit, KeyboardInterrupt):
+      raise
+    except Exception as e:
+      raise RaspadorMapContextError(url=url, error=e)
+    if not isinstance(graphs, dict):
+      raise RaspadorMapContextError(url=url, error=ValueError(f'Expected an object of graphs, found {type(graphs).__name__}'))
+    with self._lock:
+      self._entries[key] = (stat, digest, graphs, time.monotonic())
+      self.miss_count += 1
+    return {**graphs}
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
+
+  def _hit(self, graphs: Dict[str, any]) -> Dict[str, any]:
+    with self._lock:
+      self.hit_count += 1
+    return {**graphs}
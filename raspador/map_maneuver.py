@@ -1,12 +1,21 @@
+import os
 import json
+import hashlib
 
-from time import sleep
-from jsoncomment import JsonComment
-from typing import Optional, Dict, List, Callable, Union
+from time import sleep, perf_counter
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Dict, List, Callable, Union, Set, Tuple
 from io_map import IOMap, IOMapKey, IOMapOption, IOMapGraph
-from data_layer import locator_factory
 from .pilot import Pilot
+from .browser_interactor import BrowserInteractor
+from .map_context import MapContextCache
+from .map_plan import MapGraphPlan
+from .map_class import MapClassCache
+from .map_profile import MapGraphProfile
+from .map_cache import MapNodeCache
+from .map_stream import MapGraphStream
 from .maneuver import Maneuver, OrdnanceManeuver
+from .error import RaspadorMapNodeOptionError
 
 class MapGraphsEntryManeuver(OrdnanceManeuver[Pilot, Optional[any]]):
   entry_key: str
@@ -16,8 +25,12 @@ class MapGraphsEntryManeuver(OrdnanceManeuver[Pilot, Optional[any]]):
   auto_register: bool
   register_identifiers: List[str]
   strict_json: bool
+  compile_plan: bool
+  profile: bool
+  consumer: Optional[Callable[[List[any]], None]]
+  stream_buffer_size: int
 
-  def __init__(self, entry_key: str, map_context: Dict[str, any]={}, map_context_urls: List[str]=[], clear_registries: bool=False, auto_register: bool=True, register_identifiers: List[str]=[], strict_json: bool=False):
+  def __init__(self, entry_key: str, map_context: Dict[str, any]={}, map_context_urls: List[str]=[], clear_registries: bool=False, auto_register: bool=True, register_identifiers: List[str]=[], strict_json: bool=False, compile_plan: bool=False, profile: bool=False, consumer: Optional[Callable[[List[any]], None]]=None, stream_buffer_size: int=10000):
     self.no_ordnance_values = []
     self.entry_key = entry_key
     self.map_context = {**map_context}
@@ -26,6 +39,10 @@ class MapGraphsEntryManeuver(OrdnanceManeuver[Pilot, Optional[any]]):
     self.auto_register = auto_register
     self.register_identifiers = [*register_identifiers]
     self.strict_json = strict_json
+    self.compile_plan = compile_plan
+    self.profile = profile
+    self.consumer = consumer
+    self.stream_buffer_size = stream_buffer_size
     super().__init__()
 
   @property
@@ -34,41 +51,90 @@ class MapGraphsEntryManeuver(OrdnanceManeuver[Pilot, Optional[any]]):
 
   def prepare_map_context(self) -> Dict[str, any]:
     map_context = {**self.map_context}
-    for url in self.map_context_urls:
-      locator = locator_factory(url=url)
-      url_contents = locator.get()
-      if isinstance(url_contents, bytes):
-        url_contents = url_contents.decode()
-      url_graphs = json.loads(url_contents) if self.strict_json else JsonComment().loads(url_contents)
+    for url_graphs in MapContextCache.shared_cache().load(urls=self.map_context_urls, strict_json=self.strict_json):
       map_context.update(url_graphs)
     return map_context
 
   def attempt(self, pilot: Pilot, fly: Callable[[Maneuver], Maneuver]):
     map_context = self.prepare_map_context()
+    plan = MapGraphPlan.cached(map_context=map_context, entry_key=self.entry_key) if self.compile_plan else None
+    profile = MapGraphProfile(name=self.entry_key) if self.profile and MapGraphProfile.active is None else None
+    stream = MapGraphStream(consumer=self.consumer, max_buffer_size=self.stream_buffer_size) if self.consumer is not None and MapGraphStream.active is None else None
     with IOMap._local_registries(clear=self.clear_registries):
       previous_auto_register = IOMap.map_auto_register
       IOMap.map_auto_register = self.auto_register
+      if profile is not None:
+        MapGraphProfile.active = profile
+      if stream is not None:
+        MapGraphStream.active = stream
       try:
         IOMap._register_context(map_context)
-        entry_value = self[f'{IOMapKey.iocontext.value}.{self.entry_key}']
-        key_maps = entry_value if isinstance(entry_value, list) else [{IOMapKey.iokeymap.value: f'{IOMapKey.iocontext.value}.{self.entry_key}'}]
+        if plan is not None:
+          key_maps = plan.plan_key_maps
+        else:
+          entry_value = self[f'{IOMapKey.iocontext.value}.{self.entry_key}']
+          key_maps = entry_value if isinstance(entry_value, list) else [{IOMapKey.iokeymap.value: f'{IOMapKey.iocontext.value}.{self.entry_key}'}]
         graph = MapGraphManeuver(
-          key_maps=key_maps
+          key_maps=key_maps,
+          key_map_paths=plan.paths if plan is not None else None
         )
         fly(graph)
+        if stream is not None:
+          stream.close()
+          pilot.user.present_message(f'Streamed {stream.record_count} records from map graph {self.entry_key}')
         output = graph.deploy()
         self.load(output)
       finally:
         IOMap.map_auto_register = previous_auto_register
+        if stream is not None:
+          MapGraphStream.active = None
+          try:
+            stream.close()
+          except (SystemExit, KeyboardInterrupt):
+            raise
+          except Exception:
+            pass
+        if profile is not None:
+          MapGraphProfile.active = None
+          self.save_profile(pilot=pilot, profile=profile)
+
+  def save_profile(self, pilot: Pilot, profile: MapGraphProfile):
+    path = os.path.join('output', 'log', f'{pilot.user.date_file_name()}_{pilot.user.safe_file_name(self.entry_key)}_trace.json')
+    try:
+      profile.save_trace(path=path)
+      suffix = f'Saved trace to \'{path}\''
+    except OSError as e:
+      suffix = f'Could not save trace to \'{path}\': {e}'
+    pilot.user.present_report(report=profile.report, title='Map Graph Profile', suffix=suffix)
 
 class MapGraphManeuver(IOMapGraph, OrdnanceManeuver[Pilot, Optional[any]]):
+  cache_option_key: str='cache'
+  stream_option_key: str='stream'
+  concurrent_option_key: str='concurrent'
+
   default_key_map: Dict[str, any]
   pause: float
+  settle_timeout: Optional[float]
+  navigation_timeout: float
+  max_workers: int
+  browser: Optional[BrowserInteractor]
+  _executor: Optional[ThreadPoolExecutor]
+  key_map_paths: Optional[List[str]]
+  _prefetched: Dict[int, Future]
+  _run_count: int
 
-  def __init__(self, key_maps: Union[List[any], Dict[str, any], str], input_keys: List[str]=[], output_keys: List[str]=[], private_keys: List[str]=[], default_key_map: Dict[str, any]={IOMapKey.options.value: {IOMapOption.expand_at_run.value: {}}}, pause: float=1, **kwargs):
+  def __init__(self, key_maps: Union[List[any], Dict[str, any], str], input_keys: List[str]=[], output_keys: List[str]=[], private_keys: List[str]=[], default_key_map: Dict[str, any]={IOMapKey.options.value: {IOMapOption.expand_at_run.value: {}}}, pause: float=1, settle_timeout: Optional[float]=None, navigation_timeout: float=0, max_workers: int=4, key_map_paths: Optional[List[str]]=None, **kwargs):
     self.no_ordnance_values = []
     self.default_key_map = {**default_key_map}
     self.pause = pause
+    self.settle_timeout = settle_timeout
+    self.navigation_timeout = navigation_timeout
+    self.max_workers = max_workers
+    self.key_map_paths = key_map_paths
+    self.browser = None
+    self._executor = None
+    self._prefetched = {}
+    self._run_count = 0
     super().__init__(
       key_maps=key_maps,
       input_keys=input_keys,
@@ -79,8 +145,181 @@ class MapGraphManeuver(IOMapGraph, OrdnanceManeuver[Pilot, Optional[any]]):
     OrdnanceManeuver.__init__(self)
     self.key_maps = list(map(lambda m: type(self)._merged_key_map(default_key_map, m), self.key_maps))
   
+  @classmethod
+  def map_class(cls, key_map: any) -> Optional[type]:
+    if not isinstance(key_map, dict) or not isinstance(key_map.get(IOMapKey.map.value), str):
+      return None
+    return MapClassCache.resolve(key_map[IOMapKey.map.value])
+
+  @classmethod
+  def run_references(cls, value: any, prefixes: Tuple[str, ...]=('run.',)) -> Set[str]:
+    if isinstance(value, str):
+      return {value} if value.startswith(prefixes) else set()
+    if isinstance(value, dict):
+      return set().union(*(cls.run_references(v, prefixes=prefixes) for v in [*value.keys(), *value.values()]))
+    if isinstance(value, list):
+      return set().union(*(cls.run_references(v, prefixes=prefixes) for v in value))
+    return set()
+
+  @classmethod
+  def key_map_reads(cls, key_map: Dict[str, any]) -> Set[str]:
+    return cls.run_references([key_map.get(IOMapKey.construct.value), key_map.get(IOMapKey.input.value)])
+
+  @classmethod
+  def key_map_writes(cls, key_map: Dict[str, any]) -> Set[str]:
+    return cls.run_references(key_map.get(IOMapKey.output.value))
+
+  @classmethod
+  def is_concurrent(cls, key_map: any) -> bool:
+    if not isinstance(key_map, dict) or IOMapKey.iokeymap.value in key_map:
+      return False
+    options = key_map.get(IOMapKey.options.value, {})
+    if IOMapOption.expand_at_run.value not in options or options.get(cls.concurrent_option_key) is not True:
+      return False
+    map_class = cls.map_class(key_map)
+    return map_class is not None and not issubclass(map_class, Maneuver)
+
+  @classmethod
+  def cache_option(cls, key_map: any) -> Optional[Dict[str, any]]:
+    if not isinstance(key_map, dict) or not isinstance(key_map.get(IOMapKey.options.value), dict):
+      return None
+    option = key_map[IOMapKey.options.value].get(cls.cache_option_key)
+    if option is True:
+      return {}
+    return option if isinstance(option, dict) else None
+
+  @classmethod
+  def stream_option(cls, key_map: any) -> Optional[Union[bool, List[str]]]:
+    if not isinstance(key_map, dict) or not isinstance(key_map.get(IOMapKey.options.value), dict):
+      return None
+    option = key_map[IOMapKey.options.value].get(cls.stream_option_key)
+    return option if option is True or isinstance(option, list) else None
+
+  @classmethod
+  def runnable_map(cls, key_map: any) -> any:
+    if not isinstance(key_map, dict) or not isinstance(key_map.get(IOMapKey.options.value), dict):
+      return key_map
+    node_option_keys = [cls.cache_option_key, cls.stream_option_key, cls.concurrent_option_key]
+    if not any(k in key_map[IOMapKey.options.value] for k in node_option_keys):
+      return key_map
+    options = {k: v for k, v in key_map[IOMapKey.options.value].items() if k not in node_option_keys}
+    return {**key_map, IOMapKey.options.value: options}
+
+  def streamed_output(self, key_map: Dict[str, any], output: Dict[str, any]) -> Dict[str, any]:
+    stream_option = self.stream_option(key_map=key_map)
+    if stream_option is None or MapGraphStream.active is None or not isinstance(output, dict):
+      return output
+    stream_keys = list(output) if stream_option is True else [k for k in stream_option if k in output]
+    for key in stream_keys:
+      MapGraphStream.active.emit_value(output[key])
+    return {k: v for k, v in output.items() if k not in stream_keys}
+
+  def node_cache_key(self, key_map: Dict[str, any]) -> Optional[str]:
+    references = self.run_references([key_map.get(IOMapKey.construct.value), key_map.get(IOMapKey.input.value)], prefixes=('run.', 'iocontext.'))
+    try:
+      inputs = {r: self[r] for r in sorted(references)}
+      node_json = json.dumps({'map': self.runnable_map(key_map=key_map), 'inputs': inputs}, sort_keys=True)
+    except (SystemExit, KeyboardInterrupt):
+      raise
+    except Exception:
+      return None
+    return hashlib.sha1(node_json.encode()).hexdigest()
+
+  def key_map_index(self, expanded_map: Dict[str, any]) -> Optional[int]:
+    position = self._run_count if self._run_count < len(self.key_maps) else None
+    if position is not None and self.key_maps[position] == expanded_map:
+      return position
+    indices = [i for i, m in enumerate(self.key_maps) if m == expanded_map]
+    # expansion can change a map so that it no longer equals its key map, in which case graph order identifies the node
+    return indices[0] if len(indices) == 1 else position
+
+  def key_map_path(self, index: Optional[int]) -> str:
+    if index is None:
+      return f'key_maps.{self._run_count}'
+    return self.key_map_paths[index] if self.key_map_paths is not None and index < len(self.key_map_paths) else f'key_maps.{index}'
+
+  def concurrent_group(self, index: Optional[int]) -> List[int]:
+    if index is None or self.max_workers < 2 or not self.is_concurrent(self.key_maps[index]):
+      return []
+    group = [index]
+    writes = self.key_map_writes(self.key_maps[index])
+    for next_index in range(index + 1, len(self.key_maps)):
+      key_map = self.key_maps[next_index]
+      if not self.is_concurrent(key_map) or self.key_map_reads(key_map) & writes:
+        break
+      group.append(next_index)
+      writes |= self.key_map_writes(key_map)
+    return group if len(group) > 1 else []
+
+  def attempt(self, pilot: Pilot, fly: Callable[[Maneuver], Maneuver], scraper: 'Raspador'):
+    self.browser = pilot.browser
+    self._run_count = 0
+    node_cache = MapNodeCache() if MapNodeCache.active is None else None
+    if node_cache is not None:
+      MapNodeCache.active = node_cache
+    try:
+      super().attempt(pilot=pilot, fly=fly, scraper=scraper)
+    finally:
+      if node_cache is not None:
+        MapNodeCache.active = None
+      self.browser = None
+      self._prefetched = {}
+      if self._executor is not None:
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
   def run_map(self, expanded_map: Dict[str, any]) -> Dict[str, any]:
-    output = super().run_map(expanded_map=expanded_map)
-    if self.pause > 0:
-      sleep(self.pause)
-    return output
\ No newline at end of file
+    profile = MapGraphProfile.current()
+    index = self.key_map_index(expanded_map=expanded_map)
+    path = self.key_map_path(index=index)
+    self._run_count += 1
+    cache_option = self.cache_option(key_map=expanded_map)
+    if cache_option is not None and self.stream_option(key_map=expanded_map) is not None:
+      raise RaspadorMapNodeOptionError(path=path, message=f'{self.cache_option_key} and {self.stream_option_key} cannot be combined because streamed outputs are not retained')
+    cache_key = self.node_cache_key(key_map=expanded_map) if cache_option is not None and MapNodeCache.active is not None else None
+    if cache_key is not None:
+      start_time = perf_counter()
+      hit, output = MapNodeCache.active.get(key=cache_key, ttl=cache_option.get('ttl'))
+      if hit:
+        with profile.node(path=path) as node_path:
+          profile.add(path=node_path, phase='cache', duration=perf_counter() - start_time)
+        self._prefetched.pop(index, None)
+        return self.streamed_output(key_map=expanded_map, output=output)
+      profile.add(path=profile.node_path(path), phase='cache', duration=perf_counter() - start_time)
+    output = self.run_node(expanded_map=expanded_map, index=index, path=path, profile=profile)
+    if cache_key is not None:
+      MapNodeCache.active.put(key=cache_key, value=output, ttl=cache_option.get('ttl'))
+    return self.streamed_output(key_map=expanded_map, output=output)
+
+  def run_node(self, expanded_map: Dict[str, any], index: Optional[int], path: str, profile: MapGraphProfile) -> Dict[str, any]:
+    if index in self._prefetched:
+      future = self._prefetched.pop(index)
+      with profile.node(path=path) as node_path, profile.phase(path=node_path, phase='join'):
+        return future.result()
+    group = self.concurrent_group(index=index)
+    if group:
+      if self._executor is None:
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=type(self).__name__)
+      super_run_map = super().run_map
+      run_map = lambda m: super_run_map(expanded_map=self.runnable_map(key_map=m))
+      futures = [
+        self._executor.submit(profile.timed, profile.node_path(self.key_map_path(index=i)), 'run', run_map, self.key_maps[i])
+        for i in group
+      ]
+      self._prefetched = dict(zip(group[1:], futures[1:]))
+      with profile.node(path=path) as node_path, profile.phase(path=node_path, phase='join'):
+        return futures[0].result()
+    with profile.node(path=path) as node_path:
+      wait_time = self.browser.wait_time if self.browser is not None else 0
+      with profile.phase(path=node_path, phase='run'):
+        output = super().run_map(expanded_map=self.runnable_map(key_map=expanded_map))
+      if self.browser is not None:
+        profile.add(path=node_path, phase='browser_wait', duration=self.browser.wait_time - wait_time)
+      is_last = index is not None and index == len(self.key_maps) - 1
+      if not is_last and self.settle_timeout is not None and self.browser is not None:
+        with profile.phase(path=node_path, phase='settle'):
+          self.browser.settle(timeout=self.settle_timeout, navigation_timeout=self.navigation_timeout)
+      elif not is_last and self.pause > 0:
+        with profile.phase(path=node_path, phase='pause'):
+          sleep(self.pause)
+    return output
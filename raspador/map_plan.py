@@ -0,0 +1,194 @@
+import os
+import copy
+import json
+import hashlib
+import threading
+
+from typing import Optional, Dict, List
+from io_map import IOMapKey, IOMapGraph
+from .map_class import MapClassCache
+from .error import RaspadorMapPlanError
+
+class MapGraphPlan:
+  context_prefix: str='iocontext.'
+  literal_prefix: str='str.'
+  version: int=2
+  plan_cache: Dict[str, 'MapGraphPlan']={}
+  _lock: threading.Lock=threading.Lock()
+
+  entry_key: str
+  key_maps: List[any]
+  digest: str
+  paths: List[str]
+
+  @classmethod
+  def context_digest(cls, map_context: Dict[str, any], entry_key: str) -> str:
+    return hashlib.sha1(json.dumps({'version': cls.version, 'entry_key': entry_key, 'map_context': map_context}, sort_keys=True, default=str).encode()).hexdigest()
+
+  @classmethod
+  def plan_path(cls, digest: str, directory: Optional[str]=None) -> str:
+    return os.path.join(directory if directory is not None else os.path.join('output', 'plan'), f'{digest}.json')
+
+  @classmethod
+  def cached(cls, map_context: Dict[str, any], entry_key: str, directory: Optional[str]=None, save: bool=True) -> 'MapGraphPlan':
+    digest = cls.context_digest(map_context=map_context, entry_key=entry_key)
+    with cls._lock:
+      plan = cls.plan_cache.get(digest)
+    if plan is None:
+      path = cls.plan_path(digest=digest, directory=directory)
+      plan = cls.load(path=path) if os.path.exists(path) else None
+      if plan is None:
+        plan = cls.compile(map_context=map_context, entry_key=entry_key)
+        if save:
+          plan.save(path=path)
+      with cls._lock:
+        cls.plan_cache[digest] = plan
+    return plan
+
+  @classmethod
+  def compile(cls, map_context: Dict[str, any], entry_key: str) -> 'MapGraphPlan':
+    entry_reference = f'{cls.context_prefix}{entry_key}'
+    compiler = _PlanCompiler(plan_class=cls, map_context=map_context)
+    entry_value = compiler.dereference(reference=entry_reference)
+    paths = []
+    key_maps = compiler.compile_list(items=entry_value if isinstance(entry_value, list) else [entry_reference], reference=entry_reference, paths=paths)
+    return cls(entry_key=entry_key, key_maps=key_maps, digest=cls.context_digest(map_context=map_context, entry_key=entry_key), paths=paths)
+
+  @classmethod
+  def load(cls, path: str) -> Optional['MapGraphPlan']:
+    try:
+      with open(path) as f:
+        plan_json = json.load(f)
+      if plan_json.get('version') != cls.version:
+        return None
+      return cls(entry_key=plan_json['entry_key'], key_maps=plan_json['key_maps'], digest=plan_json['digest'], paths=plan_json.get('paths'))
+    except (OSError, ValueError, KeyError):
+      return None
+
+  def __init__(self, entry_key: str, key_maps: List[any], digest: str, paths: Optional[List[str]]=None):
+    self.entry_key = entry_key
+    self.key_maps = key_maps
+    self.digest = digest
+    self.paths = paths if paths is not None else [f'{self.context_prefix}{entry_key}.{i}' for i in range(len(key_maps))]
+
+  def __len__(self) -> int:
+    return len(self.key_maps)
+
+  @property
+  def plan_key_maps(self) -> List[any]:
+    return copy.deepcopy(self.key_maps)
+
+  def save(self, path: str):
+    try:
+      os.makedirs(os.path.dirname(path), exist_ok=True)
+      with open(f'{path}.tmp', 'w') as f:
+        json.dump({'version': self.version, 'entry_key': self.entry_key, 'digest': self.digest, 'key_maps': self.key_maps, 'paths': self.paths}, f, default=str)
+      os.replace(f'{path}.tmp', path)
+    except (OSError, TypeError, ValueError):
+      pass
+
+class _PlanCompiler:
+  plan_class: type
+  map_context: Dict[str, any]
+  _references: List[str]
+
+  def __init__(self, plan_class: type, map_context: Dict[str, any]):
+    self.plan_class = plan_class
+    self.map_context = map_context
+    self._references = []
+
+  def resolve(self, reference: str) -> Optional[any]:
+    value = self.map_context
+    for component in reference[len(self.plan_class.context_prefix):].split('.'):
+      if isinstance(value, dict) and component in value:
+        value = value[component]
+      elif isinstance(value, list) and component.isdigit() and int(component) < len(value):
+        value = value[int(component)]
+      else:
+        return None
+    return value
+
+  def is_static(self, reference: str) -> bool:
+    return reference.startswith(self.plan_class.context_prefix) and reference[len(self.plan_class.context_prefix):].split('.')[0] in self.map_context
+
+  def dereference(self, reference: str) -> any:
+    if reference in self._references:
+      raise RaspadorMapPlanError(reference=reference, message=f'circular reference through {" -> ".join(self._references)}')
+    value = self.resolve(reference=reference)
+    if value is None:
+      raise RaspadorMapPlanError(reference=reference, message='reference not found')
+    return value
+
+  def compile_list(self, items: List[any], reference: str, paths: Optional[List[str]]=None) -> List[any]:
+    key_maps = []
+    for index, item in enumerate(items):
+      item_reference = f'{reference}.{index}'
+      if isinstance(item, str) and self.is_static(item):
+        value = self.dereference(reference=item)
+        self._references.append(item)
+        try:
+          if isinstance(value, dict):
+            key_maps.append(self.compile_key_map(key_map=value, reference=item))
+            if paths is not None:
+              paths.append(item)
+          else:
+            key_maps.extend(self.compile_list(items=value if isinstance(value, list) else [value], reference=item, paths=paths))
+        finally:
+          self._references.pop()
+      elif isinstance(item, list):
+        key_maps.extend(self.compile_list(items=item, reference=item_reference, paths=paths))
+      else:
+        key_maps.append(self.compile_key_map(key_map=item, reference=item_reference) if isinstance(item, dict) else item)
+        if paths is not None:
+          paths.append(item_reference)
+    return key_maps
+
+  def compile_key_map(self, key_map: Dict[str, any], reference: str) -> Dict[str, any]:
+    key_map = {**key_map}
+    if IOMapKey.iokeymap.value in key_map:
+      base_reference = key_map.pop(IOMapKey.iokeymap.value)
+      if not isinstance(base_reference, str) or not self.is_static(base_reference):
+        raise RaspadorMapPlanError(reference=reference, message=f'cannot inherit from {base_reference}')
+      base = self.dereference(reference=base_reference)
+      if not isinstance(base, dict):
+        raise RaspadorMapPlanError(reference=base_reference, message='inherited value is not a key map')
+      self._references.append(base_reference)
+      try:
+        base = self.compile_key_map(key_map=base, reference=base_reference)
+      finally:
+        self._references.pop()
+      key_map = IOMapGraph._merged_key_map(base, key_map)
+    map_path = key_map.get(IOMapKey.map.value)
+    if not isinstance(map_path, str):
+      raise RaspadorMapPlanError(reference=reference, message='key map has no map')
+    map_class = MapClassCache.resolve(map_path)
+    construct = key_map.get(IOMapKey.construct.value)
+    if map_class is not None and issubclass(map_class, IOMapGraph) and isinstance(construct, dict) and isinstance(construct.get('key_maps'), list):
+      literal_key_maps = self.unescaped(value=construct['key_maps'], list_level=True)
+      if literal_key_maps is not None:
+        compiled_key_maps = self.compile_list(items=literal_key_maps, reference=f'{reference}.{IOMapKey.construct.value}.key_maps')
+        key_map[IOMapKey.construct.value] = {**construct, 'key_maps': self.escaped(value=compiled_key_maps)}
+    return key_map
+
+  def unescaped(self, value: any, list_level: bool=False) -> Optional[any]:
+    literal_prefix = self.plan_class.literal_prefix
+    if isinstance(value, str):
+      if value.startswith(literal_prefix):
+        return value[len(literal_prefix):]
+      return value if list_level and self.is_static(value) else None
+    if isinstance(value, list):
+      items = [self.unescaped(value=v, list_level=list_level) for v in value]
+      return None if any(i is None for i, v in zip(items, value) if v is not None) else items
+    if isinstance(value, dict):
+      items = {k: self.unescaped(value=v) for k, v in value.items()}
+      return None if any(items[k] is None for k, v in value.items() if v is not None) else items
+    return value
+
+  def escaped(self, value: any) -> any:
+    if isinstance(value, str):
+      return f'{self.plan_class.literal_prefix}{value}'
+    if isinstance(value, list):
+      return [self.escaped(value=v) for v in value]
+    if isinstance(value, dict):
+      return {k: self.escaped(value=v) for k, v in value.items()}
+    return value
@@ -0,0 +1,115 @@
+import os
+import json
+import time
+import threading
+import pandas as pd
+
+from contextlib import contextmanager
+from typing import Optional, Dict, List, Callable
+
+class MapGraphProfile:
+  active: Optional['MapGraphProfile']=None
+  disabled: Optional['MapGraphProfile']=None
+  phases: List[str]=['cache', 'run', 'join', 'browser_wait', 'pause', 'settle']
+
+  name: str
+  enabled: bool
+  events: List[Dict[str, any]]
+  node_times: Dict[str, Dict[str, float]]
+  _start_time: float
+  _local: threading.local
+  _lock: threading.Lock
+
+  @classmethod
+  def current(cls) -> 'MapGraphProfile':
+    if cls.active is not None:
+      return cls.active
+    if cls.disabled is None:
+      cls.disabled = cls(name='disabled', enabled=False)
+    return cls.disabled
+
+  def __init__(self, name: str, enabled: bool=True):
+    self.name = name
+    self.enabled = enabled
+    self.events = []
+    self.node_times = {}
+    self._start_time = time.perf_counter()
+    self._local = threading.local()
+    self._lock = threading.Lock()
+
+  @property
+  def report(self) -> pd.DataFrame:
+    columns = ['count', 'total', *self.phases]
+    rows = {p: {c: t.get(c, 0) for c in columns} for p, t in self.node_times.items()}
+    report = pd.DataFrame.from_dict(rows, orient='index', columns=columns)
+    report.index.name = 'node'
+    return report.sort_values('total', ascending=False) if not report.empty else report
+
+  @property
+  def trace(self) -> Dict[str, any]:
+    return {'traceEvents': [*self.events], 'displayTimeUnit': 'ms', 'otherData': {'name': self.name}}
+
+  def node_path(self, path: str) -> str:
+    stack = getattr(self._local, 'stack', [])
+    return '/'.join([*stack[-1:], path])
+
+  @contextmanager
+  def node(self, path: str):
+    node_path = self.node_path(path)
+    if not self.enabled:
+      yield node_path
+      return
+    stack = getattr(self._local, 'stack', [])
+    self._local.stack = [*stack, node_path]
+    start_time = time.perf_counter()
+    try:
+      yield node_path
+    finally:
+      self._local.stack = stack
+      self.record(path=node_path, phase='total', start_time=start_time, duration=time.perf_counter() - start_time, count=True)
+
+  @contextmanager
+  def phase(self, path: str, phase: str):
+    if not self.enabled:
+      yield
+      return
+    start_time = time.perf_counter()
+    try:
+      yield
+    finally:
+      self.record(path=path, phase=phase, start_time=start_time, duration=time.perf_counter() - start_time)
+
+  def timed(self, path: str, phase: str, function: Callable[..., any], *args, **kwargs) -> any:
+    with self.phase(path=path, phase=phase):
+      return function(*args, **kwargs)
+
+  def add(self, path: str, phase: str, duration: float):
+    if not self.enabled:
+      return
+    with self._lock:
+      times = self.node_times.setdefault(path, {})
+      times[phase] = times.get(phase, 0) + duration
+
+  def record(self, path: str, phase: str, start_time: float, duration: float, count: bool=False):
+    if not self.enabled:
+      return
+    with self._lock:
+      times = self.node_times.setdefault(path, {})
+      times[phase] = times.get(phase, 0) + duration
+      if count:
+        times['count'] = times.get('count', 0) + 1
+      self.events.append({
+        'name': path if phase == 'total' else phase,
+        'cat': 'node' if phase == 'total' else phase,
+        'ph': 'X',
+        'ts': (start_time - self._start_time) * 1e6,
+        'dur': duration * 1e6,
+        'pid': os.getpid(),
+        'tid': threading.get_ident(),
+        'args': {'node': path},
+      })
+
+  def save_trace(self, path: str):
+    with open(f'{path}.tmp', 'w') as f:
+      json.dump(self.trace, f)
+    os.replace(f'{path}.tmp', path)
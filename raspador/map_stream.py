@@ -0,0 +1,101 @@
+import os
+import queue
+import threading
+import pandas as pd
+
+from typing import Optional, List, Callable, Iterator
+
+class MapGraphStream:
+  active: Optional['MapGraphStream']=None
+
+  consumer: Callable[[List[any]], None]
+  batch_size: int
+  record_count: int
+  error: Optional[Exception]
+  _queue: queue.Queue
+  _thread: Optional[threading.Thread]
+  _closed: bool
+
+  @classmethod
+  def csv_writer(cls, path: str, include_index: bool=False) -> Callable[[List[any]], None]:
+    def write(records: List[any]):
+      report = pd.DataFrame.from_records([r if isinstance(r, dict) else {'value': r} for r in records])
+      report.to_csv(path, mode='a', header=not os.path.exists(path) or os.path.getsize(path) == 0, index=include_index)
+    return write
+
+  @classmethod
+  def records(cls, value: any, chunk_size: int=1000) -> Iterator[any]:
+    if isinstance(value, pd.DataFrame):
+      for start in range(0, len(value), chunk_size):
+        yield from value.iloc[start:start + chunk_size].to_dict(orient='records')
+    elif isinstance(value, (str, bytes, dict)) or not hasattr(value, '__iter__'):
+      yield value
+    else:
+      # lists, tuples and generators; a node may return a generator to emit records as it produces them
+      for item in value:
+        if isinstance(item, pd.DataFrame):
+          yield from cls.records(item, chunk_size=chunk_size)
+        else:
+          yield item
+
+  def __init__(self, consumer: Callable[[List[any]], None], batch_size: int=1000, max_buffer_size: int=10000):
+    self.consumer = consumer
+    self.batch_size = batch_size
+    self.record_count = 0
+    self.error = None
+    self._queue = queue.Queue(maxsize=max(max_buffer_size, 1))
+    self._thread = None
+    self._closed = False
+
+  def emit(self, record: any):
+    if self.error is not None:
+      raise self.error
+    if self._closed:
+      raise ValueError('Cannot emit to a closed stream')
+    if self._thread is None:
+      self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+      self._thread.start()
+    self._queue.put(record)
+    self.record_count += 1
+
+  def emit_value(self, value: any):
+    for record in self.records(value, chunk_size=self.batch_size):
+      self.emit(record)
+
+  def flush(self):
+    if self._thread is not None:
+      self._queue.join()
+    if self.error is not None:
+      raise self.error
+
+  def close(self):
+    if self._closed:
+      return
+    self._closed = True
+    if self._thread is not None:
+      self._queue.put(None)
+      self._thread.join()
+      self._thread = None
+    if self.error is not None:
+      raise self.error
+
+  def _run(self):
+    finished = False
+    while not finished:
+      batch = [self._queue.get()]
+      while batch[-1] is not None and len(batch) < self.batch_size:
+        try:
+          batch.append(self._queue.get_nowait())
+        except queue.Empty:
+          break
+      finished = batch[-1] is None
+      records = batch[:-1] if finished else batch
+      if records and self.error is None:
+        try:
+          self.consumer(records)
+        except (SystemExit, KeyboardInterrupt):
+          raise
+        except Exception as e:
+          self.error = e
+      for _ in batch:
+        self._queue.task_done()
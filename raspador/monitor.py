@@ -0,0 +1,113 @@
+import os
+import time
+import hashlib
+import threading
+
+from typing import Optional
+from .browser_interactor import BrowserInteractor
+
+class Monitor:
+  frame_rate: float
+  source_interval: float
+  file_name: str
+  frame_count: int
+  skipped_frame_count: int
+  error: Optional[Exception]
+  _browser: Optional[BrowserInteractor]
+  _last_hash: Optional[str]
+  _last_source_hash: Optional[str]
+  _last_source_time: Optional[float]
+  _event: threading.Event
+  _thread: Optional[threading.Thread]
+  _stopped: bool
+
+  def __init__(self, frame_rate: float=1.0, source_interval: float=5.0, file_name: str='monitor'):
+    self.frame_rate = frame_rate
+    self.source_interval = source_interval
+    self.file_name = file_name
+    self.frame_count = 0
+    self.skipped_frame_count = 0
+    self.error = None
+    self._browser = None
+    self._last_hash = None
+    self._last_source_hash = None
+    self._last_source_time = None
+    self._event = threading.Event()
+    self._thread = None
+    self._stopped = False
+
+  @property
+  def image_path(self) -> str:
+    return os.path.join('output', 'image', f'{self.file_name}.png')
+
+  @property
+  def html_path(self) -> str:
+    return os.path.join('output', 'html', f'{self.file_name}.html')
+
+  def update(self, browser: BrowserInteractor):
+    if self._stopped:
+      return
+    self._browser = browser
+    if self._thread is None:
+      self._thread = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+      self._thread.start()
+    self._event.set()
+
+  def stop(self):
+    self._stopped = True
+    self._event.set()
+    if self._thread is not None:
+      self._thread.join()
+      self._thread = None
+
+  def capture(self):
+    browser = self._browser
+    if browser is None:
+      return
+    png = browser.create_screenshot_png()
+    image = browser.create_screenshot() if png is None else None
+    frame_bytes = png if png is not None else image.tobytes() if image is not None else None
+    frame_hash = hashlib.md5(frame_bytes).hexdigest() if frame_bytes is not None else None
+    frame_changed = frame_hash is not None and frame_hash != self._last_hash
+    # the source is pulled when the screenshot changes, and otherwise only every source_interval so that changes that do not show on screen still arrive
+    source_due = frame_hash is None or self._last_source_time is None or time.monotonic() - self._last_source_time >= self.source_interval
+    source_changed = False
+    if frame_changed or source_due:
+      source = browser.driver.page_source
+      self._last_source_time = time.monotonic()
+      source_hash = hashlib.md5(source.encode()).hexdigest() if source else None
+      source_changed = source_hash is not None and source_hash != self._last_source_hash
+      self._last_source_hash = source_hash
+    if not frame_changed and not source_changed:
+      self.skipped_frame_count += 1
+      return
+    if frame_changed:
+      self._last_hash = frame_hash
+      if png is not None:
+        with open(f'{self.image_path}.tmp', 'wb') as f:
+          f.write(png)
+        os.replace(f'{self.image_path}.tmp', self.image_path)
+      else:
+        image.save(f'{self.image_path}.tmp', format='png')
+        os.replace(f'{self.image_path}.tmp', self.image_path)
+    if source_changed:
+      with open(f'{self.html_path}.tmp', 'w') as f:
+        f.write(source)
+      os.replace(f'{self.html_path}.tmp', self.html_path)
+    self.frame_count += 1
+
+  def _run(self):
+    while not self._stopped:
+      self._event.wait()
+      self._event.clear()
+      if self._stopped:
+        break
+      start_time = time.monotonic()
+      try:
+        self.capture()
+      except (SystemExit, KeyboardInterrupt):
+        raise
+      except Exception as e:
+        self.error = e
+      if self.frame_rate > 0:
+        time.sleep(max(1 / self.frame_rate - (time.monotonic() - start_time), 0))
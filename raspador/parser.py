@@ -1,4 +1,7 @@
 from __future__ import annotations
+import copy
+import hashlib
+from collections import OrderedDict
 from .base import Ordnance
 from .browser_interactor import BrowserInteractor
 from urllib.parse import urljoin
@@ -7,6 +10,12 @@ from bs4 import BeautifulSoup, PageElement
 from io_map import IOMap
 
 class Parser(IOMap):
+  features: str='html.parser'
+  soup_cache_size: int=8
+  shared_soup: bool=True
+  soup_cache: OrderedDict=OrderedDict()
+  xpath_index_cache: OrderedDict=OrderedDict()
+
   source: Optional[str]
   url: Optional[str]
   soup: Optional[BeautifulSoup]
@@ -15,9 +24,47 @@ class Parser(IOMap):
   def from_browser(cls, browser: BrowserInteractor):
     return cls(source=browser.current_source, url=browser.current_url)
 
-  def __init__(self, source: Optional[str]=None, url: Optional[str]=None):
+  @classmethod
+  def cached_soup(cls, source: str, features: str) -> BeautifulSoup:
+    """Returns a soup shared with every parser of the same source, which must be treated as read-only.
+
+    Parsers that modify their soup should set `shared_soup` to False to receive a private copy.
+    """
+    key = (hashlib.sha1(source.encode()).hexdigest(), features)
+    if key in Parser.soup_cache:
+      Parser.soup_cache.move_to_end(key)
+      return Parser.soup_cache[key] if cls.shared_soup else copy.copy(Parser.soup_cache[key])
+    soup = BeautifulSoup(source, features=features)
+    if Parser.soup_cache_size > 0:
+      Parser.soup_cache[key] = soup
+      while len(Parser.soup_cache) > Parser.soup_cache_size:
+        Parser.soup_cache.popitem(last=False)
+      if not cls.shared_soup:
+        return copy.copy(soup)
+    return soup
+
+  @classmethod
+  def xpath_index(cls, root: PageElement) -> Dict[int, int]:
+    key = id(root)
+    if key in Parser.xpath_index_cache and Parser.xpath_index_cache[key][0] is root:
+      Parser.xpath_index_cache.move_to_end(key)
+      return Parser.xpath_index_cache[key][1]
+    index = {}
+    counts = {}
+    for tag in root.find_all(True):
+      count_key = (id(tag.parent), tag.name)
+      counts[count_key] = counts.get(count_key, 0) + 1
+      index[id(tag)] = counts[count_key]
+    Parser.xpath_index_cache[key] = (root, index)
+    while len(Parser.xpath_index_cache) > max(Parser.soup_cache_size, 1):
+      Parser.xpath_index_cache.popitem(last=False)
+    return index
+
+  def __init__(self, source: Optional[str]=None, url: Optional[str]=None, features: Optional[str]=None):
     self.url = url
     self.source = source
+    if features is not None:
+      self.features = features
     self.load_soup()
 
   @property
@@ -33,7 +80,7 @@ class Parser(IOMap):
     return urljoin(self.url, url)
 
   def load_soup(self) -> Optional[BeautifulSoup]:
-    self.soup = BeautifulSoup(self.source, features='html.parser') if self.source is not None else None
+    self.soup = type(self).cached_soup(source=self.source, features=self.features) if self.source is not None else None
     return self.soup
 
   def load_browser(self, browser: BrowserInteractor):
@@ -45,20 +92,31 @@ class Parser(IOMap):
     return self
 
   def xpath_for_element(self, element: PageElement) -> str:
-    xpath_components_reversed = []
-    e = element
-    while e.parent is not None:
-      if e.name:
-        index = 1
-        for c in e.parent.children:
-          if c is e:
-            break
-          if c.name != e.name:
-            continue
-          index += 1
-        xpath_components_reversed.append(f'{e.name}[{index}]')
-      e = e.parent
-    return '/'.join(reversed(xpath_components_reversed))
+    return self.xpaths_for_elements(elements=[element])[0]
+
+  def xpaths_for_elements(self, elements: List[PageElement]) -> List[str]:
+    xpaths = {}
+    def xpath_for(element: PageElement, index: Dict[int, int]) -> str:
+      ancestors = []
+      e = element
+      while e.parent is not None and id(e) not in xpaths:
+        ancestors.append(e)
+        e = e.parent
+      xpath = xpaths.get(id(e), '')
+      for a in reversed(ancestors):
+        if a.name:
+          component = f'{a.name}[{index[id(a)]}]'
+          xpath = f'{xpath}/{component}' if xpath else component
+        xpaths[id(a)] = xpath
+      return xpath
+
+    result = []
+    for element in elements:
+      root = element
+      while root.parent is not None:
+        root = root.parent
+      result.append(xpath_for(element=element, index=type(self).xpath_index(root=root)))
+    return result
 
   def run(self, *args, **kwargs):
     self.parse(*args, **kwargs)
@@ -73,10 +131,10 @@ class SeekParser(Generic[O], OrdnanceParser[O]):
   _instruction: str
   seeker: Callable[[BeautifulSoup, SeekParser, ...], Optional[O]]
 
-  def __init__(self, instruction: str, seeker: Optional[Callable[[BeautifulSoup, SeekParser, ...], Optional[PageElement]]]=None, source: Optional[str]=None, url: Optional[str]=None, seek: Dict[str, any]={}):
+  def __init__(self, instruction: str, seeker: Optional[Callable[[BeautifulSoup, SeekParser, ...], Optional[PageElement]]]=None, source: Optional[str]=None, url: Optional[str]=None, seek: Dict[str, any]={}, features: Optional[str]=None):
     self._instruction = instruction
     self.seeker = seeker if seeker is not None else SoupSeeker(**seek)
-    super().__init__(source=source, url=url)
+    super().__init__(source=source, url=url, features=features)
 
   @property
   def instruction(self) -> str:
@@ -1,12 +1,13 @@
 import os
-import sys
 import pdb
 import bdb
 import click
 import logging
 import signal
+import random
 import hashlib
 import inspect
+import weakref
 import traceback
 import pandas as pd
 
@@ -19,22 +20,59 @@ from .base import MenuOption, ControlMode, ControlAction, Ordnance
 from .error import RaspadorDidNotCompleteManuallyError, RaspadorInvalidManeuverError, RaspadorInvalidPositionError, RaspadorInteract, RaspadorSkip, RaspadorSkipOver, RaspadorSkipUp, RaspadorSkipToBreak, RaspadorQuit, RaspadorUnexpectedResultsError
 from .style import Format, Styled
 from .parser import Parser
+from .flight_log import FlightLog, FlightLogStream
 from data_layer import Redshift as SQL
-from typing import Dict, List, Optional, TypeVar, Generic, Union
+from typing import Dict, List, Optional, TypeVar, Generic, Union, Callable, Tuple, Generator
 from enum import Enum
 from io_map import IOMap
 
+class Flight:
+  maneuver: Maneuver
+  parent: Optional['Flight']
+  root_mission: List[Maneuver]
+  option: Optional[MenuOption]=None
+  error: Optional[BaseException]=None
+  position: Optional[Position]=None
+  started: bool=False
+  attempt: Optional[Generator[Optional[Maneuver], Maneuver, Optional[Maneuver]]]=None
+  submaneuver: Optional[Maneuver]=None
+  returned: bool=False
+
+  def __init__(self, maneuver: Maneuver, mission: List[Maneuver]=[], parent: Optional['Flight']=None):
+    self.maneuver = maneuver
+    self.parent = parent
+    self.root_mission = mission if parent is None else parent.root_mission
+
+  @property
+  def mission(self) -> List[Maneuver]:
+    maneuvers = []
+    flight = self.parent
+    while flight is not None:
+      maneuvers.append(flight.maneuver)
+      flight = flight.parent
+    return [*self.root_mission, *reversed(maneuvers)]
+
+  def reset_attempt(self):
+    self.started = False
+    self.attempt = None
+    self.submaneuver = None
+    self.returned = False
+
 class Raspador(IOMap):
+  _attempt_arguments_cache: weakref.WeakKeyDictionary=weakref.WeakKeyDictionary()
+
   browser: BrowserInteractor
   user: UserInteractor
   configuration: Dict[str, any]
-  flight_logs: List[pd.DataFrame]
+  flight_logs: List[FlightLog]
+  flight_log_stream: Optional[FlightLogStream]
 
   def __init__(self, browser: Optional[BrowserInteractor]=None, user: Optional[UserInteractor]=None, configuration: Dict[str, any]=None, interactive: Optional[bool]=None):
     self.configuration = configuration if configuration else {}
     self.browser = browser if browser else BrowserInteractor()
     self.user = user if user else UserInteractor(driver=self.browser.driver)
-    self.flight_logs = [pd.DataFrame()]
+    self.flight_logs = [FlightLog()]
+    self.flight_log_stream = None
     if interactive is not None:
       self.user.interactive = interactive
 
@@ -47,115 +85,173 @@ class Raspador(IOMap):
     return type(self).__name__
 
   @property
-  def flight_log(self) -> pd.DataFrame:
+  def current_flight_log(self) -> FlightLog:
     return self.flight_logs[-1]
 
+  @property
+  def flight_log(self) -> pd.DataFrame:
+    return self.current_flight_log.data_frame
+
   @flight_log.setter
   def flight_log(self, flight_log: pd.DataFrame):
-    self.flight_logs[-1] = flight_log
+    self.flight_logs[-1] = FlightLog.from_data_frame(flight_log)
 
   @property
-  def top_maneuvers_report(self) -> pd.DataFrame:
-    report = self.flight_log[['maneuver', 'option', 'result']].groupby(['maneuver', 'option', 'result']).size()
-    return report
+  def top_maneuvers_report(self) -> pd.Series:
+    return self.current_flight_log.top_maneuvers_report
 
   @property
-  def top_errors_report(self) -> pd.DataFrame:
-    report = self.flight_log[self.flight_log.error != ''][['error', 'maneuver']].groupby(['error', 'maneuver']).size()
-    return report
+  def top_errors_report(self) -> pd.Series:
+    return self.current_flight_log.top_errors_report
 
   def scrape(self):
-    if not self.flight_log.empty:
+    if self.flight_log_stream is not None:
+      try:
+        self.flight_log_stream.flush()
+      except OSError as e:
+        self.discard_log_stream(error=e)
+    if not self.current_flight_log.empty:
       self.user.present_report(report=self.top_maneuvers_report, title='Mission Report')
       self.user.present_report(self.top_errors_report, title='Error Report')
       self.save_log()
-      unexpected_results = list(filter(lambda r: r not in ['Completed', ''], self.flight_log.result.unique()))
+      unexpected_results = list(filter(lambda r: r not in ['Completed', ''], self.current_flight_log.results))
       if unexpected_results:
         unexpected_results_error = RaspadorUnexpectedResultsError(unexpected_results=unexpected_results)
         if self.user.interactive:
           self.user.present_message('Unexpected results.', error=unexpected_results_error)
         else:
           raise unexpected_results_error
-      self.flight_logs.append(pd.DataFrame())
+      self.flight_logs.append(FlightLog())
 
   def run(self):
     self.scrape()
 
   def fly(self, pilot: Pilot, maneuver: Maneuver, mission: List[Maneuver]=[]):
-    option = None
-    error = None
-    position = None
-    while True:
+    flights = [Flight(maneuver=maneuver, mission=mission)]
+    raised = None
+    while flights:
+      flight = flights[-1]
+      pending = None
       try:
-        if self.user.monitor:
-          self.user.locals = {
-            'log': self.flight_log,
-            'browser': pilot.browser,
-            **self.user.python_locals,
-          }
-          self.user.save_image(file_name='monitor', quiet=True)
-          self.user.locals = self.user.python_locals
-        if not isinstance(maneuver, Maneuver):
-          raise RaspadorInvalidManeuverError(maneuver=maneuver)
-        self.user.present_message(f'{self.mission_description(pilot=pilot, mission=mission, maneuver=maneuver)}')
-        option = self.select_option(
-          maneuver=maneuver, 
-          option=option, 
-          error=error, 
-          message=f'{self.break_description(pilot=pilot, maneuver=maneuver, mission=mission)}\n'
-        )
-        if isinstance(option, ControlMode):
-          self.user.control_mode = option
-        position = Position(option=option).enter()
-        maneuver.trajectory.append(position)
-        self.attempt_option(pilot=pilot, maneuver=maneuver, mission=mission, error=error)
-        error = None
-      except KeyboardInterrupt as e:
-        error = e
-        if self.user.present_confirmation('Abort', default_response=True):
-          self.user.interactive = False
-          raise
-      except (RaspadorDidNotCompleteManuallyError, RaspadorInteract, RaspadorSkip, click.Abort) as e:
-        error = e
-      except Exception as e:
-        stack_format = traceback.format_stack()
-        _, _, trace_back = sys.exc_info()
-        error = e
-        newline = '\n'
-        empty_string = ''
-        self.user.present_message(
-          message=f'{self.mission_description(pilot=pilot, mission=mission)}\n{Format().yellow()(f"Error encountered at{newline}{empty_string.join(stack_format)}")}',
-        )
-        self.user.present_message(error=error)
-        present_postmortem = self.user.break_on_exceptions or self.user.present_confirmation(prompt='Start postmortem')
-        if present_postmortem:
-          try:
-            while True:
-              self.user.present_message(message=self.catch_description(pilot=pilot, maneuver=maneuver, mission=mission, error=error, is_postmortem=True))
-              pdb.post_mortem(t=trace_back)
-              self.user.present_message(message=self.catch_description(pilot=pilot, maneuver=maneuver, mission=mission, error=error, is_postmortem=False))
-              pdb.set_trace()
-              if not self.user.present_confirmation(prompt='Repeat postmortem'):
-                break
-          except bdb.BdbQuit as pdb_error:
-            error = pdb_error
-      finally:
-        if isinstance(error, click.Abort):
+        if raised is not None:
+          error, raised = raised, None
           raise error
-        if position is None:
-          raise RaspadorInvalidPositionError(position=position, maneuver=maneuver, error=error)
-        position.stabilize(error=error)
-        position = None
-        self.record_position(pilot=pilot, maneuver=maneuver, mission=mission)
-        maneuver.clear_run(force=True)
-        if not self.flight_control(option=option, error=error, maneuver=maneuver, mission=mission):
-          break
-        if maneuver.status.finished:
-          self.user.present_message(f'{self.mission_description(pilot=pilot, mission=mission, maneuver=maneuver, reverse=True)}')
-          if self.user.control_mode is ControlMode.step_next and self.user.control_mode in maneuver.options:
-            break_maneuver = BreakManeuver(maneuver=maneuver)
-            self.fly(pilot=pilot, maneuver=break_maneuver, mission=mission + [maneuver])
-          break
+        if not flight.started:
+          flight.started = True
+          flight.attempt = self.enter_position(pilot=pilot, flight=flight)
+        submaneuver = self.advance_attempt(flight=flight)
+        if submaneuver is not None:
+          flights.append(Flight(maneuver=submaneuver, parent=flight))
+          continue
+        flight.error = None
+      except BaseException as e:
+        try:
+          pending = self.catch_error(pilot=pilot, flight=flight, error=e)
+        except BaseException as catch_error:
+          pending = catch_error
+      flight.reset_attempt()
+      try:
+        repeat = self.stabilize_position(pilot=pilot, flight=flight)
+      except BaseException as e:
+        repeat = True
+        pending = e
+      if not repeat:
+        flights.pop()
+        if flights:
+          flights[-1].submaneuver = flight.maneuver
+      elif pending is not None:
+        flights.pop()
+        if not flights:
+          raise pending
+        raised = pending
+
+  def enter_position(self, pilot: Pilot, flight: Flight) -> Optional[Generator[Optional[Maneuver], Maneuver, Optional[Maneuver]]]:
+    maneuver = flight.maneuver
+    mission = flight.mission
+    if self.user.monitor:
+      self.user.update_monitor(browser=pilot.browser)
+    if not isinstance(maneuver, Maneuver):
+      raise RaspadorInvalidManeuverError(maneuver=maneuver)
+    pilot.browser.refresh()
+    self.user.present_message(lambda: self.mission_description(pilot=pilot, mission=mission, maneuver=maneuver))
+    flight.option = self.select_option(
+      maneuver=maneuver, 
+      option=flight.option, 
+      error=flight.error, 
+      message=lambda: f'{self.break_description(pilot=pilot, maneuver=maneuver, mission=mission)}\n'
+    )
+    if isinstance(flight.option, ControlMode):
+      self.user.control_mode = flight.option
+    flight.position = Position(option=flight.option).enter()
+    maneuver.trajectory.append(flight.position)
+    return self.attempt_option(pilot=pilot, maneuver=maneuver, mission=mission, error=flight.error)
+
+  def advance_attempt(self, flight: Flight) -> Optional[Maneuver]:
+    if flight.attempt is None or flight.returned:
+      return None
+    try:
+      return next(flight.attempt) if flight.submaneuver is None else flight.attempt.send(flight.submaneuver)
+    except StopIteration as e:
+      flight.returned = True
+      return e.value
+
+  def catch_error(self, pilot: Pilot, flight: Flight, error: BaseException) -> Optional[BaseException]:
+    maneuver = flight.maneuver
+    mission = flight.mission
+    if isinstance(error, KeyboardInterrupt):
+      flight.error = error
+      if self.user.present_confirmation('Abort', default_response=True):
+        self.user.interactive = False
+        return error
+    elif isinstance(error, (RaspadorDidNotCompleteManuallyError, RaspadorInteract, RaspadorSkip, click.Abort)):
+      flight.error = error
+    elif isinstance(error, Exception):
+      stack_format = traceback.format_stack()
+      trace_back = error.__traceback__
+      flight.error = error
+      newline = '\n'
+      empty_string = ''
+      self.user.present_message(
+        message=lambda: f'{self.mission_description(pilot=pilot, mission=mission)}\n{Format().yellow()(f"Error encountered at{newline}{empty_string.join(stack_format)}")}',
+      )
+      self.user.present_message(error=error)
+      present_postmortem = self.user.break_on_exceptions or self.user.present_confirmation(prompt='Start postmortem')
+      if present_postmortem:
+        try:
+          while True:
+            self.user.present_message(message=self.catch_description(pilot=pilot, maneuver=maneuver, mission=mission, error=error, is_postmortem=True))
+            pdb.post_mortem(t=trace_back)
+            self.user.present_message(message=self.catch_description(pilot=pilot, maneuver=maneuver, mission=mission, error=error, is_postmortem=False))
+            pdb.set_trace()
+            if not self.user.present_confirmation(prompt='Repeat postmortem'):
+              break
+        except bdb.BdbQuit as pdb_error:
+          flight.error = pdb_error
+    else:
+      return error
+    return None
+
+  def stabilize_position(self, pilot: Pilot, flight: Flight) -> bool:
+    maneuver = flight.maneuver
+    mission = flight.mission
+    error = flight.error
+    if isinstance(error, click.Abort):
+      raise error
+    if flight.position is None:
+      raise RaspadorInvalidPositionError(position=flight.position, maneuver=maneuver, error=error)
+    flight.position.stabilize(error=error)
+    flight.position = None
+    self.record_position(pilot=pilot, maneuver=maneuver, mission=mission)
+    maneuver.clear_run(force=True)
+    if not self.flight_control(option=flight.option, error=error, maneuver=maneuver, mission=mission):
+      return False
+    if maneuver.status.finished:
+      self.user.present_message(lambda: self.mission_description(pilot=pilot, mission=mission, maneuver=maneuver, reverse=True))
+      if self.user.control_mode is ControlMode.step_next and self.user.control_mode in maneuver.options:
+        break_maneuver = BreakManeuver(maneuver=maneuver)
+        self.fly(pilot=pilot, maneuver=break_maneuver, mission=mission + [maneuver])
+      return False
+    return True
   
   def flight_control(self, option: MenuOption, error: Optional[Exception], maneuver: Maneuver, mission: List[Maneuver]) -> bool:
     if option is ControlMode.step_over:
@@ -182,26 +278,38 @@ class Raspador(IOMap):
     position = maneuver.position
     if position is None:
       return
-    self.flight_log = self.flight_log.append([
-      {
-        'entry_time': position.entry_time.isoformat(),
-        'stable_time': position.stable_time.isoformat(),
-        'raspador': self.name,
-        'pilot': pilot.name,
-        'mission': ' '.join(m.name for m in mission),
-        'maneuver': maneuver.name,
-        'option': position.option.option_text,
-        'error': type(position.error).__name__ if position.error is not None else '',
-        'detail': '' if self.user.abbreviated_length == 0 else self.user.abbreviated(str(maneuver)),
-        'result': maneuver.status.value if maneuver.status.finished else '',
-        'instruction': '' if self.user.abbreviated_length == 0 else self.user.abbreviated(maneuver.instruction),
-        'id': repr(position.id),
-        'maneuver_id': repr(maneuver.id),
-        'mission_id': '.'.join(repr(m.id) for m in mission),
-      }
-    ])
+    row = {
+      'entry_time': position.entry_time.isoformat(),
+      'stable_time': position.stable_time.isoformat(),
+      'raspador': self.name,
+      'pilot': pilot.name,
+      'mission': ' '.join(m.name for m in mission),
+      'maneuver': maneuver.name,
+      'option': position.option.option_text,
+      'error': type(position.error).__name__ if position.error is not None else '',
+      'detail': self.position_detail(maneuver=maneuver),
+      'result': maneuver.status.value if maneuver.status.finished else '',
+      'instruction': '' if self.user.abbreviated_length == 0 else self.user.abbreviated(maneuver.instruction_text(length=self.user.abbreviated_length)),
+      'id': repr(position.id),
+      'maneuver_id': repr(maneuver.id),
+      'mission_id': '.'.join(repr(m.id) for m in mission),
+      'wait_time': pilot.browser.record_wait_time(),
+    }
+    self.current_flight_log.append(row)
+    if self.flight_log_stream is not None:
+      try:
+        self.flight_log_stream.write(row)
+      except OSError as e:
+        self.discard_log_stream(error=e)
   
-  def attempt_option(self, pilot: Pilot, maneuver: Maneuver, mission: List[Maneuver], error: Optional[Exception]=None):
+  def position_detail(self, maneuver: Maneuver) -> str:
+    if self.user.abbreviated_length == 0:
+      return ''
+    if maneuver.position.error is None and self.user.detail_sample_rate < 1 and random.random() >= self.user.detail_sample_rate:
+      return ''
+    return self.user.abbreviated(maneuver.representation_text(length=self.user.abbreviated_length))
+
+  def attempt_option(self, pilot: Pilot, maneuver: Maneuver, mission: List[Maneuver], error: Optional[Exception]=None) -> Optional[Generator[Optional[Maneuver], Maneuver, Optional[Maneuver]]]:
     if isinstance(maneuver.position.option, ControlMode):
       fly_mission = mission + [maneuver]
       def fly(maneuver: Maneuver) -> Maneuver:
@@ -213,27 +321,11 @@ class Raspador(IOMap):
         'scraper': self,
       }
       type(self)._register_context(attempt_arguments)
-      attempt_signature = inspect.getfullargspec(maneuver.attempt_manually if maneuver.position.option is ControlMode.manual else maneuver.attempt)
-      if not attempt_signature.varkw:
-        if len(attempt_signature.args) < 4:
-          del attempt_arguments['scraper']
-        if len(attempt_signature.args) < 3:
-          del attempt_arguments['fly']
+      attempt_method = maneuver.attempt_manually if maneuver.position.option is ControlMode.manual else maneuver.attempt
+      attempt_arguments = {n: attempt_arguments[n] for n in type(self).attempt_argument_names(attempt_method=attempt_method)}
       if maneuver.position.option is ControlMode.manual:
         self.user.present_message(self.detail_description(detail=maneuver.detail))
-        attempt = maneuver.attempt_manually(**attempt_arguments)
-      else:
-        attempt = maneuver.attempt(**attempt_arguments)
-      if attempt is not None:
-        try:
-          submaneuver = next(attempt)
-          while submaneuver is not None:
-            self.fly(pilot=pilot, maneuver=submaneuver, mission=mission + [maneuver])
-            submaneuver = attempt.send(submaneuver)
-        except StopIteration as e:
-          submaneuver = e.value
-        if submaneuver is not None:
-          self.fly(pilot=pilot, maneuver=submaneuver, mission=mission + [maneuver])
+      return attempt_method(**attempt_arguments)
     elif maneuver.position.option is ControlAction.repair_environment:
       maneuver.abort(error=error)
     elif maneuver.position.option is ControlAction.quit:
@@ -274,7 +366,27 @@ class Raspador(IOMap):
     elif maneuver.position.option is ControlAction.skip_break:
       raise RaspadorSkipToBreak(maneuver=maneuver)
 
-  def select_option(self, maneuver: Maneuver, option: Optional[MenuOption], error: Optional[Exception]=None, message: Optional[str]=None):
+  @classmethod
+  def attempt_argument_names(cls, attempt_method: Callable[..., any]) -> Tuple[str, ...]:
+    function = getattr(attempt_method, '__func__', attempt_method)
+    try:
+      return cls._attempt_arguments_cache[function]
+    except (KeyError, TypeError):
+      pass
+    attempt_signature = inspect.getfullargspec(attempt_method)
+    argument_names = ('pilot', 'fly', 'scraper')
+    if not attempt_signature.varkw:
+      if len(attempt_signature.args) < 4:
+        argument_names = argument_names[:2]
+      if len(attempt_signature.args) < 3:
+        argument_names = argument_names[:1]
+    try:
+      cls._attempt_arguments_cache[function] = argument_names
+    except TypeError:
+      pass
+    return argument_names
+
+  def select_option(self, maneuver: Maneuver, option: Optional[MenuOption], error: Optional[Exception]=None, message: Optional[Union[str, Callable[[], str]]]=None):
     options = maneuver.options
     default_option = self.default_option(maneuver=maneuver, option=option, error=error)
     if default_option not in options:
@@ -282,10 +394,10 @@ class Raspador(IOMap):
     if ControlAction.quit not in options:
       options.append(ControlAction.quit)
 
-    if error is None and default_option is self.user.control_mode and default_option not in [ControlMode.step_next, ControlMode.manual]:
+    if not self.user.interactive or (error is None and default_option is self.user.control_mode and default_option not in [ControlMode.step_next, ControlMode.manual]):
       return default_option
     else:
-      return self.user.present_menu(options=maneuver.options, default_option=default_option, message=message)
+      return self.user.present_menu(options=maneuver.options, default_option=default_option, message=message() if callable(message) else message)
 
   def default_option(self, maneuver: Maneuver, option: Optional[MenuOption], error: Optional[Exception]=None) -> MenuOption:
     if error is not None and self.user.retry is not None and len([p for p in maneuver.trajectory if p.error]) > self.user.retry and ControlAction.skip_up in maneuver.options:
@@ -356,14 +468,39 @@ class Raspador(IOMap):
       detail_styled += catch_format + ' after postmortem'
     return f'{catch_format(mission_text)}.{catch_format.bold()(maneuver.name)}\n{detail_styled.styled}\n{stack_styled.styled}'
 
+  def stream_log(self, **kwargs) -> FlightLogStream:
+    if self.flight_log_stream is None:
+      self.flight_log_stream = FlightLogStream(file_name=f'{self.user.date_file_name()}_{self.user.safe_file_name(self.description)}', **kwargs)
+    return self.flight_log_stream
+
+  def close_log_stream(self):
+    if self.flight_log_stream is None:
+      return
+    try:
+      self.flight_log_stream.close()
+    except OSError as e:
+      self.discard_log_stream(error=e)
+      return
+    self.user.present_message(f'Streamed log rows to {", ".join(repr(p) for p in self.flight_log_stream.paths)}')
+    self.flight_log_stream = None
+
+  def discard_log_stream(self, error: Exception):
+    stream = self.flight_log_stream
+    self.flight_log_stream = None
+    try:
+      stream.close()
+    except OSError:
+      pass
+    self.user.present_message(f'Stopped streaming log rows to {stream.path}', error=error)
+
   def save_log(self):
     path = os.path.join('output', 'log', f'{self.user.date_file_name()}_{self.user.safe_file_name(self.description)}.csv')
-    if self.flight_log.empty:
+    if self.current_flight_log.empty:
       self.user.present_message(f'No log to save to \'{path}\'')
       return
     
     self.flight_log.to_csv(path)
-    self.user.present_message(f'Saved {len(self.flight_log)} log rows to \'{path}\'')
+    self.user.present_message(f'Saved {len(self.current_flight_log)} log rows to \'{path}\'')
 
 O = TypeVar(any)
 class OrdnanceRaspador(Generic[O], Raspador, Ordnance[O]):
@@ -1,6 +1,7 @@
 import pytest
 
-from ..browser_interactor import BrowserInteractor
+from selenium.common.exceptions import JavascriptException, NoSuchElementException, WebDriverException
+from ..browser_interactor import BrowserInteractor, WaitEngine
 
 @pytest.fixture
 def browser():
@@ -15,4 +16,76 @@ def test_browser(browser):
   element = browser.get_existing("//a/*[text()='More information...']")
   assert element is not None
   import pdb; pdb.set_trace()
-  
\ No newline at end of file
+  
+class TDriver:
+  navigation: str
+  scripts: list
+  elements: dict
+  observer_error: bool
+
+  def __init__(self, navigation: str='stayed', elements: dict={}, observer_error: bool=False):
+    self.navigation = navigation
+    self.scripts = []
+    self.elements = {**elements}
+    self.observer_error = observer_error
+
+  def find_element(self, by: str, value: str):
+    if value not in self.elements:
+      raise NoSuchElementException(value)
+    return self.elements[value]
+
+  def set_window_size(self, *args):
+    pass
+
+  def set_script_timeout(self, timeout: float):
+    pass
+
+  def execute_async_script(self, script: str, *args):
+    self.scripts.append(script)
+    if script == BrowserInteractor.navigation_script:
+      if self.navigation == 'unloaded':
+        raise JavascriptException('Document was unloaded')
+      return self.navigation
+    if script == BrowserInteractor.observe_script:
+      if self.observer_error:
+        raise WebDriverException('observer unavailable')
+      matches = [i for i, (xpath, _) in enumerate(args[0]) if xpath in self.elements]
+      return [matches[0], self.elements[args[0][matches[0]][0]]] if matches else None
+    return True
+
+def test_settle_without_navigation():
+  driver = TDriver()
+  browser = BrowserInteractor(driver=driver, window_size=None)
+  assert browser.settle(timeout=1)
+  assert driver.scripts == [BrowserInteractor.settle_script]
+
+@pytest.mark.parametrize('navigation, navigated', [('stayed', False), ('loading', True), ('unloading', True), ('unloaded', True)])
+def test_settle_after_navigation(navigation, navigated):
+  driver = TDriver(navigation=navigation)
+  browser = BrowserInteractor(driver=driver, window_size=None)
+  assert browser.await_navigation(timeout=0.1) is navigated
+  assert browser.settle(timeout=1, navigation_timeout=0.1)
+  assert driver.scripts[-2:] == [BrowserInteractor.navigation_script, BrowserInteractor.settle_script]
+
+def test_default_wait_engine():
+  driver = TDriver(elements={'//a': 'link'})
+  browser = BrowserInteractor(driver=driver, window_size=None)
+  assert browser.wait_engine is WaitEngine.polling
+  assert browser.get_existing('//a', timeout=0.1) == 'link'
+  assert driver.scripts == []
+
+def test_observer_wait_engine():
+  driver = TDriver(elements={'//b': 'button'})
+  browser = BrowserInteractor(driver=driver, window_size=None)
+  browser.wait_engine = WaitEngine.observer
+  assert browser.wait_for_first(targets={'link': '//a', 'button': '//b'}, timeout=0.1) == ('button', 'button')
+  assert driver.scripts == [BrowserInteractor.observe_script]
+
+def test_observer_fallback():
+  driver = TDriver(elements={'//a': 'link'}, observer_error=True)
+  browser = BrowserInteractor(driver=driver, window_size=None)
+  browser.wait_engine = WaitEngine.observer
+  assert browser.get_existing('//a', timeout=0.1) == 'link'
+  assert browser.get_existing('//missing', timeout=0.1) is None
+  assert driver.scripts == [BrowserInteractor.observe_script] * 2
+  assert browser.wait_time >= 0.1
@@ -0,0 +1,136 @@
+import pytest
+
+from typing import Dict, Optional
+from ..browser_pool import BrowserPool
+from ..browser_interactor import BrowserInteractor
+
+class TBidi:
+  driver: 'TDriver'
+  count: int
+
+  def __init__(self, driver: 'TDriver'):
+    self.driver = driver
+    self.count = 0
+
+  def create_user_context(self) -> str:
+    self.count += 1
+    user_context = f'context-{self.count}'
+    self.driver.cookies[user_context] = {}
+    return user_context
+
+  def remove_user_context(self, user_context: str):
+    del self.driver.cookies[user_context]
+
+  def create(self, type: str, user_context: Optional[str]=None) -> str:
+    self.count += 1
+    handle = f'tab-{self.count}'
+    self.driver.tabs[handle] = user_context
+    return handle
+
+  def close(self, handle: str):
+    del self.driver.tabs[handle]
+
+class TSwitchTo:
+  driver: 'TDriver'
+
+  def __init__(self, driver: 'TDriver'):
+    self.driver = driver
+
+  def window(self, handle: str):
+    self.driver.current_handle = handle
+
+class TDriver:
+  quit_count: int=0
+  cookies_deleted: int=0
+  current_url: str='about:blank'
+  capabilities: Dict[str, any]
+  cookies: Dict[Optional[str], Dict[str, str]]
+  tabs: Dict[str, Optional[str]]
+  current_handle: str
+
+  def __init__(self, bidi: bool=True):
+    self.capabilities = {'webSocketUrl': 'ws://localhost/session'} if bidi else {}
+    self.cookies = {None: {}}
+    self.tabs = {'tab': None}
+    self.current_handle = 'tab'
+    self.browser = self.browsing_context = TBidi(driver=self)
+    self.switch_to = TSwitchTo(driver=self)
+
+  @property
+  def window_handles(self):
+    return list(self.tabs)
+
+  @property
+  def jar(self) -> Dict[str, str]:
+    return self.cookies[self.tabs[self.current_handle]]
+
+  def set_window_size(self, *args):
+    pass
+
+  def get(self, url: str):
+    self.current_url = url
+
+  def delete_all_cookies(self):
+    self.cookies_deleted += 1
+    self.jar.pop(self.current_url.split('/')[2] if '://' in self.current_url else self.current_url, None)
+
+  def quit(self):
+    self.quit_count += 1
+
+@pytest.fixture
+def pool() -> BrowserPool:
+  pool = BrowserPool(max_browsers=2, max_uses=2, browser_factory=lambda: BrowserInteractor(driver=TDriver(), window_size=None))
+  yield pool
+  pool.close()
+
+def test_reuse(pool):
+  with pool.browser() as browser:
+    pass
+  assert browser.driver.cookies_deleted == 1
+  assert browser.driver.current_url == 'about:blank'
+  with pool.browser() as reused_browser:
+    assert reused_browser is browser
+  assert browser.driver.quit_count == 1
+  assert pool.browser_count == 0
+
+def test_cap_and_fresh(pool):
+  first = pool.acquire()
+  second = pool.acquire()
+  assert pool.browser_count == 2
+  pool.release(first)
+  fresh = pool.acquire(fresh=True)
+  assert fresh is not first
+  assert first.driver.quit_count == 1
+  pool.release(second)
+  pool.release(fresh)
+  assert pool.idle_count == 2
+
+def test_recycle_on_error(pool):
+  with pytest.raises(ValueError):
+    with pool.browser() as browser:
+      raise ValueError()
+  assert browser.driver.quit_count == 1
+  assert pool.idle_count == 0
+
+def test_reset_fresh_context(pool):
+  pool.max_uses = 3
+  with pool.browser() as browser:
+    browser.navigate('https://a.example.com/login')
+    browser.driver.jar['a.example.com'] = 'session'
+    # reached through a redirect, so it is never the current url on release
+    browser.driver.jar['sso.example.com'] = 'session'
+  assert browser.driver.window_handles == [browser.driver.current_handle]
+  assert browser.driver.jar == {}
+  assert list(browser.driver.cookies) == [None, browser.user_context]
+  with pool.browser() as reused_browser:
+    reused_browser.driver.jar['b.example.com'] = 'session'
+  assert list(browser.driver.cookies) == [None, browser.user_context]
+  assert browser.driver.jar == {}
+
+def test_discard_without_contexts():
+  pool = BrowserPool(browser_factory=lambda: BrowserInteractor(driver=TDriver(bidi=False), window_size=None))
+  with pool.browser() as browser:
+    browser.navigate('https://a.example.com/')
+  assert browser.driver.quit_count == 1
+  assert pool.idle_count == 0
+  assert pool.browser_count == 0
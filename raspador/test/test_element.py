@@ -0,0 +1,96 @@
+import pytest
+
+from typing import Dict, List, Optional
+from ..element import ElementCollection
+from ..parser import Parser
+from ..browser_interactor import BrowserInteractor
+
+class TElement:
+  text: str
+  attributes: Dict[str, str]
+  classes: List[str]
+  style: Dict[str, str]
+
+  def __init__(self, text: str, attributes: Dict[str, str]={}):
+    self.text = text
+    self.attributes = {**attributes}
+    self.classes = []
+    self.style = {}
+
+class TDriver:
+  nodes: Dict[str, TElement]
+  script_count: int
+
+  def __init__(self, nodes: Dict[str, TElement]):
+    self.nodes = nodes
+    self.script_count = 0
+
+  def set_window_size(self, *args):
+    pass
+
+  def execute_script(self, script: str, xpaths: List[str], *args):
+    self.script_count += 1
+    nodes = [self.nodes.get(x) for x in xpaths]
+    if script == ElementCollection.resolve_script:
+      return nodes
+    if script == ElementCollection.read_script:
+      attributes, styles = args
+      return [{'text': n.text, 'attributes': {a: n.attributes.get(a) for a in attributes}, 'styles': {s: n.style.get(s, '') for s in styles}} if n is not None else None for n in nodes]
+    if script == ElementCollection.apply_script:
+      operation, name, values = args
+      present = [n for n in nodes if n is not None]
+      for index, node in enumerate(present):
+        if operation == 'add_class':
+          node.classes.append(name)
+        elif operation == 'remove_class':
+          node.classes.remove(name)
+        elif operation == 'style':
+          node.style[name] = values[index % len(values)]
+      return len(present)
+    raise ValueError(script)
+
+@pytest.fixture
+def parser() -> Parser:
+  yield Parser(source='<html><body><p>one</p><div><p>two</p></div><a href="/three">three</a></body></html>')
+
+@pytest.fixture
+def driver() -> TDriver:
+  yield TDriver(nodes={
+    'html[1]/body[1]/p[1]': TElement(text='one'),
+    'html[1]/body[1]/div[1]/p[1]': TElement(text='two'),
+    'html[1]/body[1]/a[1]': TElement(text='three', attributes={'href': '/three'}),
+  })
+
+@pytest.fixture
+def collection(parser, driver) -> ElementCollection:
+  browser = BrowserInteractor(driver=driver, window_size=None)
+  yield ElementCollection.from_soup_elements(soup_elements=parser.soup.find_all(['p', 'a']), parser=parser, browser=browser)
+
+def test_resolve(collection, driver):
+  assert collection.xpaths == list(driver.nodes)
+  assert collection.xpath == ' | '.join(driver.nodes)
+  assert [e.element for e in collection] == list(driver.nodes.values())
+  assert driver.script_count == 1
+  assert collection[2].soup_element.name == 'a'
+
+def test_resolve_missing(collection, driver):
+  del driver.nodes['html[1]/body[1]/a[1]']
+  collection.load_existing(timeout=0)
+  assert collection.elements[2] is None
+  assert collection.expire().elements is None
+
+def test_read(collection, driver):
+  assert collection.texts() == ['one', 'two', 'three']
+  records = collection.read(attributes=['href'], styles=['color'])
+  assert records[2]['attributes'] == {'href': '/three'}
+  assert records[0]['styles'] == {'color': ''}
+  assert driver.script_count == 2
+
+def test_apply(collection, driver):
+  collection.add_class('selected').set_css_property('color', 'red').highlight()
+  assert all(n.classes == ['selected'] for n in driver.nodes.values())
+  assert all(n.style['color'] == 'red' for n in driver.nodes.values())
+  assert len({n.style['background'] for n in driver.nodes.values()}) == 2
+  collection.remove_class('selected')
+  assert all(n.classes == [] for n in driver.nodes.values())
+  assert driver.script_count == 4
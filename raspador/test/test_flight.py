@@ -0,0 +1,126 @@
+import pytest
+
+from typing import List
+from ..raspador import Raspador, Flight
+from ..browser_interactor import BrowserInteractor
+from ..user_interactor import UserInteractor
+from ..pilot import Pilot
+from ..maneuver import Maneuver
+
+class TDriver:
+  current_url: str='about:blank'
+  page_source: str='<html></html>'
+
+  def set_window_size(self, *args):
+    pass
+
+class TRecordManeuver(Maneuver):
+  events: List[str]
+  label: str
+
+  def __init__(self, events: List[str], label: str):
+    super().__init__()
+    self.events = events
+    self.label = label
+
+class TLeafManeuver(TRecordManeuver):
+  failures: int
+
+  def __init__(self, events: List[str], label: str, failures: int=0):
+    super().__init__(events=events, label=label)
+    self.failures = failures
+
+  def attempt(self, pilot: Pilot):
+    self.events.append(self.label)
+    if self.failures > 0:
+      self.failures -= 1
+      raise ValueError(self.label)
+
+class TParentManeuver(TRecordManeuver):
+  children: List[Maneuver]
+
+  def __init__(self, events: List[str], label: str, children: List[Maneuver]):
+    super().__init__(events=events, label=label)
+    self.children = children
+
+  def attempt(self, pilot: Pilot):
+    for child in self.children:
+      completed = yield child
+      self.events.append(f'{self.label} <- {completed.label} {completed.status.value}')
+
+@pytest.fixture
+def scraper() -> Raspador:
+  browser = BrowserInteractor(driver=TDriver(), window_size=None)
+  user = UserInteractor(interactive=False, quiet=True, retry=1, break_on_exceptions=False)
+  user.present_confirmation = lambda prompt='', default_response=False: False
+  yield Raspador(browser=browser, user=user)
+
+@pytest.fixture
+def pilot(scraper) -> Pilot:
+  yield Pilot(browser=scraper.browser, user=scraper.user)
+
+def test_flight_mission():
+  root = Flight(maneuver=Maneuver(), mission=[])
+  child = Flight(maneuver=Maneuver(), parent=root)
+  grandchild = Flight(maneuver=Maneuver(), parent=child)
+  assert grandchild.mission == [root.maneuver, child.maneuver]
+  assert grandchild.root_mission is root.root_mission
+
+def test_nested_yields(scraper, pilot):
+  events = []
+  inner = TParentManeuver(events=events, label='inner', children=[TLeafManeuver(events=events, label='leaf')])
+  outer = TParentManeuver(events=events, label='outer', children=[inner, TLeafManeuver(events=events, label='last')])
+  scraper.fly(pilot=pilot, maneuver=outer)
+  assert events == ['leaf', 'inner <- leaf Completed', 'outer <- inner Completed', 'last', 'outer <- last Completed']
+  log = scraper.flight_log
+  assert log.loc[log.maneuver == 'TLeafManeuver', 'mission'].tolist() == ['TParentManeuver TParentManeuver', 'TParentManeuver']
+
+def test_retry(scraper, pilot):
+  events = []
+  leaf = TLeafManeuver(events=events, label='leaf', failures=1)
+  scraper.fly(pilot=pilot, maneuver=TParentManeuver(events=events, label='parent', children=[leaf]))
+  assert events == ['leaf', 'leaf', 'parent <- leaf Completed']
+  assert [type(p.error).__name__ if p.error else None for p in leaf.trajectory] == ['ValueError', None]
+
+def test_skip_after_retries(scraper, pilot):
+  events = []
+  failing = TLeafManeuver(events=events, label='failing', failures=10)
+  parent = TParentManeuver(events=events, label='parent', children=[failing])
+  outer = TParentManeuver(events=events, label='outer', children=[parent, TLeafManeuver(events=events, label='after')])
+  scraper.fly(pilot=pilot, maneuver=outer)
+  assert events == ['failing', 'failing', 'outer <- parent Skipped', 'after', 'outer <- after Completed']
+  assert failing.status is Maneuver.Status.skipped
+
+class TFlyManeuver(TLeafManeuver):
+  def attempt(self, pilot: Pilot, fly):
+    pass
+
+class TScraperManeuver(TFlyManeuver):
+  def attempt(self, pilot: Pilot, fly, scraper):
+    pass
+
+class TKeywordManeuver(TLeafManeuver):
+  def attempt(self, pilot: Pilot, **kwargs):
+    pass
+
+def test_attempt_argument_names():
+  events = []
+  assert Raspador.attempt_argument_names(attempt_method=TLeafManeuver(events=events, label='leaf').attempt) == ('pilot',)
+  assert Raspador.attempt_argument_names(attempt_method=TFlyManeuver(events=events, label='fly').attempt) == ('pilot', 'fly')
+  assert Raspador.attempt_argument_names(attempt_method=TScraperManeuver(events=events, label='scraper').attempt) == ('pilot', 'fly', 'scraper')
+  assert Raspador.attempt_argument_names(attempt_method=TKeywordManeuver(events=events, label='keyword').attempt) == ('pilot', 'fly', 'scraper')
+
+def test_attempt_argument_names_cache(monkeypatch):
+  events = []
+  first = TFlyManeuver(events=events, label='first')
+  assert Raspador.attempt_argument_names(attempt_method=first.attempt) == ('pilot', 'fly')
+  assert TFlyManeuver.attempt in Raspador._attempt_arguments_cache
+  def getfullargspec(function):
+    raise AssertionError('the cached argument names should be reused')
+  monkeypatch.setattr('inspect.getfullargspec', getfullargspec)
+  second = TFlyManeuver(events=events, label='second')
+  assert Raspador.attempt_argument_names(attempt_method=second.attempt) == ('pilot', 'fly')
+  assert Raspador.attempt_argument_names(attempt_method=TFlyManeuver.attempt) == ('pilot', 'fly')
+  monkeypatch.undo()
+  # an override is a different function, so a subclass never reuses its parent's entry
+  assert Raspador.attempt_argument_names(attempt_method=TScraperManeuver(events=events, label='override').attempt) == ('pilot', 'fly', 'scraper')
@@ -0,0 +1,68 @@
+import pytest
+
+from ..flight_log import FlightLog, FlightLogStream
+
+@pytest.fixture
+def flight_log() -> FlightLog:
+  flight_log = FlightLog()
+  for index in range(3):
+    flight_log.append({
+      'maneuver': f'TManeuver{index}',
+      'option': '(A)utomatic',
+      'error': '' if index < 2 else 'RaspadorSkip',
+      'result': 'Completed' if index < 2 else 'Skipped',
+    })
+  yield flight_log
+
+def test_data_frame_schema(flight_log):
+  data_frame = flight_log.data_frame
+  assert list(data_frame.columns) == FlightLog.columns
+  assert FlightLog.columns[-1] == 'wait_time'
+  assert len(data_frame) == 3
+  assert data_frame.iloc[-1].error == 'RaspadorSkip'
+
+def test_data_frame_cache(flight_log):
+  data_frame = flight_log.data_frame
+  assert flight_log.data_frame is data_frame
+  flight_log.append({'maneuver': 'TManeuver3'})
+  assert flight_log.data_frame is not data_frame
+  assert len(flight_log.data_frame) == 4
+
+def test_extend(flight_log):
+  parent_log = FlightLog()
+  parent_log.extend(flight_log)
+  parent_log.extend(flight_log.data_frame)
+  assert len(parent_log) == 6
+  assert parent_log.row(-1)['error'] == 'RaspadorSkip'
+
+def test_empty():
+  flight_log = FlightLog()
+  assert flight_log.empty
+  assert flight_log.data_frame.empty
+
+def test_stream(flight_log, tmp_path):
+  stream = FlightLogStream(file_name='test', directory=str(tmp_path), batch_size=2, max_file_size=1)
+  stream.write_log(flight_log)
+  stream.flush()
+  assert len(stream.paths) == 2
+  assert len(FlightLogStream.load(stream.paths)) == 3
+  stream.close()
+  assert stream.error is None
+
+def test_stream_error(flight_log, tmp_path):
+  stream = FlightLogStream(file_name='test', directory=str(tmp_path / 'missing'))
+  stream.write_log(flight_log)
+  with pytest.raises(OSError):
+    stream.flush()
+  with pytest.raises(OSError):
+    stream.write(flight_log.row(0))
+  with pytest.raises(OSError):
+    stream.close()
+
+def test_reports(flight_log):
+  data_frame = flight_log.data_frame
+  maneuvers_report = data_frame[['maneuver', 'option', 'result']].groupby(['maneuver', 'option', 'result']).size()
+  errors_report = data_frame[data_frame.error != ''][['error', 'maneuver']].groupby(['error', 'maneuver']).size()
+  assert flight_log.top_maneuvers_report.equals(maneuvers_report)
+  assert flight_log.top_errors_report.to_dict() == errors_report.to_dict()
+  assert flight_log.results == ['Completed', 'Skipped']
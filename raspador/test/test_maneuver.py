@@ -0,0 +1,46 @@
+import pytest
+import pandas as pd
+
+from io_map import IOMap
+from ..maneuver import Summary, Maneuver, OrdnanceManeuver
+
+class TLarge:
+  def __repr__(self) -> str:
+    return 'x' * 1000000
+
+def test_summarized_text():
+  assert Summary.summarized(value='short', length=10) == 'short'
+  assert Summary.summarized(value='a' * 20, length=10) == f'{"a" * 10}...'
+  assert Summary.summarized(value='a' * 20, length=-1) == 'a' * 20
+
+def test_summarized_budget():
+  value = {'first': 'a' * 50, 'second': ['b' * 50, {'third': 'c' * 50}], 'count': 3}
+  summary = Summary.summarized(value=value, length=120)
+  assert summary['first'] == 'a' * 50
+  assert summary['second'][0] == 'b' * 50
+  assert summary['second'][1]['third'] == 'cccc...'
+  assert summary['count'] == 3
+  assert repr(Summary.summarized(value=value, length=60)['second']) == '...'
+
+def test_summarized_containers():
+  assert repr(Summary.summarized(value=list(range(100)), length=80)) == '<list len=100>'
+  assert Summary.summarized(value=(1, 2), length=80) == (1, 2)
+  assert repr(Summary.summarized(value=pd.DataFrame({'a': [1, 2, 3]}), length=80)) == '<DataFrame shape=(3, 1)>'
+
+def test_summarized_unknown_object():
+  summary = Summary.summarized(value=TLarge(), length=100)
+  assert repr(summary) == f'<TLarge {"x" * 100}...>'
+  assert Summary.summarized(value=[TLarge()], length=100)[0].text.startswith('<TLarge')
+
+class TOrdnanceManeuver(OrdnanceManeuver):
+  pass
+
+def test_representation_text(monkeypatch):
+  def render(self):
+    raise AssertionError('the full map should not be rendered')
+  monkeypatch.setattr(IOMap, '__str__', render)
+  maneuver = TOrdnanceManeuver()
+  assert 'perform TOrdnanceManeuver' in maneuver.representation_text(length=100)
+  maneuver.ordnance = TLarge()
+  assert len(maneuver.representation_text(length=100)) < 500
+  assert maneuver.representation_length == -1
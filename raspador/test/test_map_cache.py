@@ -0,0 +1,29 @@
+import os
+import pytest
+
+from ..map_cache import MapNodeCache
+
+@pytest.fixture
+def cache(tmp_path) -> MapNodeCache:
+  yield MapNodeCache(directory=str(tmp_path), max_size=1024)
+
+def test_memory(cache):
+  assert cache.get(key='a') == (False, None)
+  cache.put(key='a', value={'output': 1})
+  assert cache.get(key='a') == (True, {'output': 1})
+  assert not os.listdir(cache.directory)
+  assert (cache.hit_count, cache.miss_count) == (1, 1)
+
+def test_disk(cache):
+  cache.put(key='a', value={'output': 1}, ttl=60)
+  reloaded = MapNodeCache(directory=cache.directory)
+  assert reloaded.get(key='a', ttl=60) == (True, {'output': 1})
+  os.utime(cache.path(key='a'), (0, 0))
+  assert MapNodeCache(directory=cache.directory).get(key='a', ttl=60) == (False, None)
+
+def test_evict(cache):
+  for index in range(4):
+    cache.put(key=str(index), value='x' * 400, ttl=60)
+    os.utime(cache.path(key=str(index)), (index, index))
+  cache.evict()
+  assert sorted(os.listdir(cache.directory)) == ['2.pickle', '3.pickle']
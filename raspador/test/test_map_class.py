@@ -0,0 +1,28 @@
+import pytest
+
+from ..map_class import MapClassCache
+from ..maneuver import NavigationManeuver
+
+@pytest.fixture
+def cache():
+  MapClassCache.clear()
+  yield MapClassCache
+  MapClassCache.clear()
+
+def test_resolve(cache):
+  assert cache.resolve('iomap.raspador.maneuver/NavigationManeuver') is NavigationManeuver
+  assert cache.resolve('iomap.raspador.maneuver/NavigationManeuver') is NavigationManeuver
+  assert cache.resolve('iomap.raspador.maneuver/MissingManeuver') is None
+  assert cache.resolve('iomap.raspador.maneuver/MissingManeuver') is None
+  assert (cache.hit_count, cache.miss_count) == (2, 2)
+
+def test_invalidate(cache):
+  from .. import maneuver
+  assert cache.resolve('iomap.raspador.maneuver/LateManeuver') is None
+  maneuver.LateManeuver = NavigationManeuver
+  try:
+    assert cache.resolve('iomap.raspador.maneuver/LateManeuver') is None
+    cache.invalidate('iomap.raspador.maneuver/LateManeuver')
+    assert cache.resolve('iomap.raspador.maneuver/LateManeuver') is NavigationManeuver
+  finally:
+    del maneuver.LateManeuver
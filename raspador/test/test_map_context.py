@@ -0,0 +1,74 @@
+import os
+import pytest
+
+from ..map_context import MapContextCache
+from ..error import RaspadorMapContextError
+
+@pytest.fixture
+def fetches() -> list:
+  yield []
+
+@pytest.fixture
+def cache(fetches) -> MapContextCache:
+  def fetch(url: str) -> bytes:
+    fetches.append(url)
+    with open(url, 'rb') as f:
+      return f.read()
+  yield MapContextCache(fetch=fetch)
+
+def write_graphs(path: str, text: str, mtime_ns: int):
+  with open(path, 'w') as f:
+    f.write(text)
+  os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def test_reuse(cache, fetches, tmp_path):
+  path = str(tmp_path / 'graphs.json')
+  write_graphs(path=path, text='// comment\n{"start": {"map": "iomap.a/B"},}', mtime_ns=1_000_000_000)
+  graphs = cache.get(url=path)
+  graphs['extra'] = {}
+  reused_graphs = cache.get(url=path)
+  assert reused_graphs == {'start': {'map': 'iomap.a/B'}}
+  assert reused_graphs['start'] is graphs['start']
+  assert fetches == [path]
+  assert (cache.hit_count, cache.miss_count) == (1, 1)
+
+def test_changed_file(cache, fetches, tmp_path):
+  path = str(tmp_path / 'graphs.json')
+  write_graphs(path=path, text='{"start": 1}', mtime_ns=1_000_000_000)
+  cache.get(url=path)
+  write_graphs(path=path, text='{"start": 2}', mtime_ns=2_000_000_000)
+  assert cache.get(url=path) == {'start': 2}
+  write_graphs(path=path, text='{"start": 2}', mtime_ns=3_000_000_000)
+  assert cache.get(url=path) == {'start': 2}
+  assert len(fetches) == 3
+  assert (cache.hit_count, cache.miss_count) == (1, 2)
+
+def test_remote_ttl(monkeypatch):
+  fetches = []
+  def fetch(url: str) -> str:
+    fetches.append(url)
+    return '{"start": 1}'
+  now = [1000.0]
+  monkeypatch.setattr('time.monotonic', lambda: now[0])
+  cache = MapContextCache(remote_ttl=60, fetch=fetch)
+  url = 'https://example.com/graphs.json'
+  cache.get(url=url)
+  now[0] += 59
+  assert cache.get(url=url) == {'start': 1}
+  assert len(fetches) == 1
+  now[0] += 1
+  assert cache.get(url=url) == {'start': 1}
+  assert len(fetches) == 2
+  assert (cache.hit_count, cache.miss_count) == (2, 1)
+
+def test_load_order(cache, tmp_path):
+  paths = [str(tmp_path / f'graphs{i}.json') for i in range(5)]
+  for index, path in enumerate(paths):
+    write_graphs(path=path, text=f'{{"graph{index}": {index}}}', mtime_ns=1_000_000_000)
+  assert cache.load(urls=paths) == [{f'graph{i}': i} for i in range(5)]
+
+def test_invalid(cache, tmp_path):
+  path = str(tmp_path / 'graphs.json')
+  write_graphs(path=path, text='[1, 2]', mtime_ns=1_000_000_000)
+  with pytest.raises(RaspadorMapContextError):
+    cache.get(url=path, strict_json=True)
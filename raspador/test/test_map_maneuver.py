@@ -0,0 +1,49 @@
+import threading
+import pytest
+
+from io_map import IOMap, IOMapGraph
+from ..map_maneuver import MapGraphsEntryManeuver, MapGraphManeuver
+
+class TFetch(IOMap):
+  pass
+
+fetch = 'iomap.raspador.test.test_map_maneuver/TFetch'
+
+def key_map(name: str, concurrent: bool=True, **kwargs) -> dict:
+  return {'map': fetch, 'construct': {'name': name}, 'options': {'expand_at_run': {}, 'concurrent': concurrent}, **kwargs}
+
+@pytest.fixture
+def runs(monkeypatch) -> list:
+  runs = []
+  def run_map(self, expanded_map):
+    runs.append((expanded_map['construct']['name'], threading.current_thread().name))
+    return {'name': expanded_map['construct']['name']}
+  monkeypatch.setattr(IOMapGraph, 'run_map', run_map)
+  yield runs
+
+def test_concurrent_group(runs):
+  graph = MapGraphManeuver(key_maps=[key_map('a', output={'x': 'run.a'}), key_map('b'), key_map('c', input={'x': 'run.a'})], pause=0)
+  outputs = [graph.run_map(expanded_map=m) for m in graph.key_maps]
+  assert [o['name'] for o in outputs] == ['a', 'b', 'c']
+  assert sorted(n for n, _ in runs) == ['a', 'b', 'c']
+  assert all(t.startswith('MapGraphManeuver') for n, t in runs if n in ('a', 'b'))
+  assert [t for n, t in runs if n == 'c'] == [threading.current_thread().name]
+
+def test_opt_in(runs):
+  graph = MapGraphManeuver(key_maps=[key_map('a', concurrent=False), key_map('b', concurrent=False)], pause=0)
+  assert not graph.is_concurrent(graph.key_maps[0])
+  for m in graph.key_maps:
+    graph.run_map(expanded_map=m)
+  assert all(t == threading.current_thread().name for _, t in runs)
+
+def test_expanded_map_without_match(runs):
+  graph = MapGraphManeuver(key_maps=[key_map('a'), key_map('b')], pause=0)
+  graph.run_map(expanded_map=graph.key_maps[0])
+  expanded_map = {**graph.key_maps[1], 'construct': {'name': 'b', 'expanded': True}}
+  assert graph.key_map_index(expanded_map=expanded_map) == 1
+  assert graph.run_map(expanded_map=expanded_map) == {'name': 'b'}
+  assert sorted(n for n, _ in runs) == ['a', 'b']
+
+def test_profile_opt_in():
+  assert not MapGraphsEntryManeuver(entry_key='start').profile
+  assert MapGraphsEntryManeuver(entry_key='start', profile=True).profile
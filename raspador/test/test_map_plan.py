@@ -0,0 +1,73 @@
+import pytest
+
+from ..map_plan import MapGraphPlan
+from ..error import RaspadorMapPlanError
+
+navigation = 'iomap.raspador.maneuver/NavigationManeuver'
+
+@pytest.fixture
+def map_context() -> dict:
+  yield {
+    'start': {
+      'map': 'iomap.raspador.map_maneuver/MapGraphManeuver',
+      'construct': {
+        'key_maps': [
+          'iocontext.first',
+          'iocontext.first.0',
+          {'map': f'str.{navigation}', 'construct': {'url': 'str.str.https://example.com/end'}},
+        ],
+      },
+    },
+    'first': [
+      {'map': navigation, 'construct': {'url': 'iocontext.pilot.base_url'}},
+      'iocontext.second',
+    ],
+    'second': {'iokeymap': 'iocontext.base'},
+    'base': {'map': navigation},
+  }
+
+def test_compile(map_context):
+  plan = MapGraphPlan.compile(map_context=map_context, entry_key='start')
+  assert len(plan) == 1
+  assert plan.key_maps[0]['construct']['key_maps'] == [
+    {'map': f'str.{navigation}', 'construct': {'url': 'str.iocontext.pilot.base_url'}},
+    {'map': f'str.{navigation}'},
+    {'map': f'str.{navigation}', 'construct': {'url': 'str.iocontext.pilot.base_url'}},
+    {'map': f'str.{navigation}', 'construct': {'url': 'str.str.https://example.com/end'}},
+  ]
+
+def test_compile_list(map_context):
+  plan = MapGraphPlan.compile(map_context=map_context, entry_key='first')
+  assert plan.key_maps == [
+    {'map': navigation, 'construct': {'url': 'iocontext.pilot.base_url'}},
+    {'map': navigation},
+  ]
+
+def test_cached(map_context, tmp_path):
+  plan = MapGraphPlan.cached(map_context=map_context, entry_key='first', directory=str(tmp_path))
+  assert MapGraphPlan.cached(map_context=map_context, entry_key='first', directory=str(tmp_path)) is plan
+  loaded = MapGraphPlan.load(path=MapGraphPlan.plan_path(digest=plan.digest, directory=str(tmp_path)))
+  assert loaded.key_maps == plan.key_maps
+
+def test_errors(map_context):
+  with pytest.raises(RaspadorMapPlanError):
+    MapGraphPlan.compile(map_context=map_context, entry_key='missing')
+  with pytest.raises(RaspadorMapPlanError):
+    MapGraphPlan.compile(map_context={**map_context, 'base': {'iokeymap': 'iocontext.second'}}, entry_key='first')
+
+def test_unresolved_class(map_context):
+  registered = {'map': 'registered/Map', 'construct': {'key_maps': ['iocontext.base']}}
+  plan = MapGraphPlan.compile(map_context={**map_context, 'base': registered}, entry_key='first')
+  assert plan.key_maps[1] == registered
+
+def test_version(map_context, tmp_path):
+  plan = MapGraphPlan.compile(map_context=map_context, entry_key='first')
+  path = MapGraphPlan.plan_path(digest=plan.digest, directory=str(tmp_path))
+  plan.save(path=path)
+  assert MapGraphPlan.load(path=path) is not None
+  MapGraphPlan.version += 1
+  try:
+    assert MapGraphPlan.load(path=path) is None
+    assert MapGraphPlan.context_digest(map_context=map_context, entry_key='first') != plan.digest
+  finally:
+    MapGraphPlan.version -= 1
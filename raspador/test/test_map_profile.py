@@ -0,0 +1,36 @@
+import json
+import pytest
+
+from ..map_profile import MapGraphProfile
+
+@pytest.fixture
+def profile() -> MapGraphProfile:
+  yield MapGraphProfile(name='test')
+
+def test_nested_nodes(profile):
+  with profile.node(path='iocontext.start') as start_path:
+    with profile.phase(path=start_path, phase='run'):
+      with profile.node(path='key_maps.0') as nested_path:
+        profile.add(path=nested_path, phase='pause', duration=0.5)
+  assert nested_path == 'iocontext.start/key_maps.0'
+  report = profile.report
+  assert report.index[0] == 'iocontext.start'
+  assert report.loc['iocontext.start/key_maps.0', 'pause'] == 0.5
+  assert report.loc['iocontext.start', 'count'] == 1
+
+def test_trace(profile, tmp_path):
+  with profile.node(path='iocontext.start') as path:
+    profile.timed(path, 'run', lambda: None)
+  trace_path = str(tmp_path / 'trace.json')
+  profile.save_trace(path=trace_path)
+  with open(trace_path) as f:
+    events = json.load(f)['traceEvents']
+  assert sorted(e['cat'] for e in events) == ['node', 'run']
+  assert all(e['ph'] == 'X' and e['dur'] >= 0 for e in events)
+
+def test_disabled():
+  profile = MapGraphProfile.current()
+  with profile.node(path='iocontext.start') as path:
+    profile.add(path=path, phase='run', duration=1)
+  assert not profile.enabled
+  assert profile.report.empty
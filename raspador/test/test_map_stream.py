@@ -0,0 +1,62 @@
+import pytest
+import pandas as pd
+
+from ..map_stream import MapGraphStream
+
+@pytest.fixture
+def batches() -> list:
+  yield []
+
+@pytest.fixture
+def stream(batches) -> MapGraphStream:
+  stream = MapGraphStream(consumer=batches.append, batch_size=10, max_buffer_size=5)
+  yield stream
+  stream.close()
+
+def test_emit(stream, batches):
+  for index in range(25):
+    stream.emit({'index': index})
+  stream.flush()
+  assert [r['index'] for b in batches for r in b] == list(range(25))
+  assert all(len(b) <= 10 for b in batches)
+  assert stream.record_count == 25
+
+def test_emit_value(stream, batches):
+  stream.emit_value(pd.DataFrame({'a': [1, 2]}))
+  stream.emit_value([3, 4])
+  stream.emit_value('five')
+  stream.close()
+  assert [r for b in batches for r in b] == [{'a': 1}, {'a': 2}, 3, 4, 'five']
+
+def test_emit_value_chunks(stream, batches):
+  records = MapGraphStream.records(pd.DataFrame({'a': range(25)}), chunk_size=10)
+  assert next(records) == {'a': 0}
+  assert [r['a'] for r in records] == list(range(1, 25))
+
+def test_emit_generator(stream, batches):
+  emitted = []
+  def produce():
+    for index in range(3):
+      emitted.append(index)
+      yield {'index': index}
+    yield pd.DataFrame({'index': [3, 4]})
+  stream.emit_value(produce())
+  stream.close()
+  assert emitted == [0, 1, 2]
+  assert [r['index'] for b in batches for r in b] == list(range(5))
+
+def test_consumer_error():
+  def fail(records):
+    raise ValueError('upload failed')
+  stream = MapGraphStream(consumer=fail)
+  stream.emit({'a': 1})
+  with pytest.raises(ValueError):
+    stream.close()
+
+def test_csv_writer(tmp_path):
+  path = str(tmp_path / 'records.csv')
+  stream = MapGraphStream(consumer=MapGraphStream.csv_writer(path=path), batch_size=2)
+  for index in range(5):
+    stream.emit({'index': index, 'name': f'row{index}'})
+  stream.close()
+  assert pd.read_csv(path)['index'].tolist() == list(range(5))
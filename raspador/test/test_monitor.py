@@ -0,0 +1,57 @@
+import pytest
+
+from ..monitor import Monitor
+
+class TDriver:
+  source_count: int
+  source: str
+
+  def __init__(self):
+    self.source_count = 0
+    self.source = '<html></html>'
+
+  @property
+  def page_source(self) -> str:
+    self.source_count += 1
+    return self.source
+
+class TBrowser:
+  driver: TDriver
+  png: bytes
+
+  def __init__(self):
+    self.driver = TDriver()
+    self.png = b'first'
+
+  def create_screenshot_png(self) -> bytes:
+    return self.png
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch) -> Monitor:
+  monkeypatch.chdir(tmp_path)
+  (tmp_path / 'output' / 'image').mkdir(parents=True)
+  (tmp_path / 'output' / 'html').mkdir(parents=True)
+  monitor = Monitor(frame_rate=0, source_interval=60)
+  monitor._browser = TBrowser()
+  yield monitor
+
+def test_skip_unchanged_screenshot(monitor):
+  driver = monitor._browser.driver
+  monitor.capture()
+  monitor.capture()
+  assert (monitor.frame_count, monitor.skipped_frame_count) == (1, 1)
+  assert driver.source_count == 1
+  monitor._browser.png = b'second'
+  monitor.capture()
+  assert monitor.frame_count == 2
+  assert driver.source_count == 2
+
+def test_source_interval(monitor):
+  driver = monitor._browser.driver
+  monitor.capture()
+  driver.source = '<html><body>changed</body></html>'
+  monitor.source_interval = 0
+  monitor.capture()
+  assert monitor.frame_count == 2
+  assert open(monitor.html_path).read() == driver.source
+  assert open(monitor.image_path, 'rb').read() == b'first'
@@ -20,3 +20,32 @@ def parser():
 
 def test_find_text(parser):
   parser.parse()
+
+def test_soup_cache():
+  source = '<html><body><a href="#">link text</a></body></html>'
+  first_parser = Parser(source=source)
+  second_parser = Parser(source=source)
+  assert second_parser.soup is first_parser.soup
+  assert Parser(source=f'{source} ').soup is not first_parser.soup
+
+def test_private_soup():
+  class TPrivateParser(Parser):
+    shared_soup = False
+  source = '<html><body><a href="#">private link</a></body></html>'
+  shared_soup = Parser(source=source).soup
+  private_parser = TPrivateParser(source=source)
+  assert private_parser.soup is not shared_soup
+  private_parser.soup.a.decompose()
+  assert shared_soup.a is not None
+  assert TPrivateParser(source=source).soup.a is not None
+
+def test_xpaths_for_elements():
+  parser = Parser(source='<html><body><p>one</p><div><p>two</p><p>three</p></div><p>four</p></body></html>')
+  elements = parser.soup.find_all('p')
+  assert parser.xpaths_for_elements(elements=elements) == [
+    'html[1]/body[1]/p[1]',
+    'html[1]/body[1]/div[1]/p[1]',
+    'html[1]/body[1]/div[1]/p[2]',
+    'html[1]/body[1]/p[2]',
+  ]
+  assert parser.xpath_for_element(element=elements[2].string) == 'html[1]/body[1]/div[1]/p[2]'
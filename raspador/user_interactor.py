@@ -19,6 +19,7 @@ from pprint import pformat
 from .base import MenuOption, ControlMode, ControlAction
 from .error import RaspadorInputTimeoutError, RaspadorCannotInteractError, RaspadorQuit
 from .style import Styled, CustomStyled, CodeStyled, Format
+from .monitor import Monitor
 from datetime import datetime
 from enum import Enum
 
@@ -75,23 +76,32 @@ class UserInteractor:
   locals: Dict[str, any]
   timeout: Optional[int]
   interactive: bool
+  quiet: bool
   monitor: bool
+  monitor_frame_rate: float
+  monitor_recorder: Optional[Monitor]
   control_mode: ControlMode
   break_on_exceptions: bool
   retry: Optional[int]
   abbreviated_length: int
+  detail_sample_rate: float
   _last_script_name: Optional[str]=None
 
-  def __init__(self, driver: Optional[any]=None, locals: Dict[str, any]={}, timeout: Optional[int]=30, interactive: bool=True, monitor: bool=False, control_mode: ControlMode=ControlMode.automatic, break_on_exceptions: bool=False, retry: Optional[int]=None, abbreviated_length: int=2048):
+  def __init__(self, driver: Optional[any]=None, locals: Dict[str, any]={}, timeout: Optional[int]=30, interactive: bool=True, monitor: bool=False, control_mode: ControlMode=ControlMode.automatic, break_on_exceptions: bool=False, retry: Optional[int]=None, abbreviated_length: int=2048, quiet: bool=False, detail_sample_rate: float=1.0, monitor_frame_rate: float=1.0):
     self.driver = driver
     self.timeout = timeout
     self.locals = self.python_locals
     self.locals.update(locals)
     self.interactive = interactive
+    self.quiet = quiet
+    self.monitor = monitor
+    self.monitor_frame_rate = monitor_frame_rate
+    self.monitor_recorder = None
     self.control_mode = control_mode
     self.break_on_exceptions = break_on_exceptions
     self.retry = retry
     self.abbreviated_length = abbreviated_length
+    self.detail_sample_rate = detail_sample_rate
 
   @classmethod
   def shell(cls, driver: Optional[any]=None, locals: Dict[str, any]={}):
@@ -153,12 +163,12 @@ class UserInteractor:
     logging.exception(error)
     root.removeHandler(handler)
 
-  def present_message(self, message: Optional[str]=None, prompt: Optional[str]=None, error: Optional[Exception]=None, response_type: any=str, default_response: Optional[any]=None):
+  def present_message(self, message: Optional[Union[str, Callable[[], str]]]=None, prompt: Optional[str]=None, error: Optional[Exception]=None, response_type: any=str, default_response: Optional[any]=None):
     response = None
     if error is not None:
       self.present_error(error)
-    if message is not None:
-      print(message)
+    if message is not None and not self.quiet:
+      print(message() if callable(message) else message)
     if prompt is not None:
         response = self.present_prompt(prompt=prompt, response_type=response_type, default_response=default_response)
     return response
@@ -169,6 +179,8 @@ class UserInteractor:
     return self.present_prompt(prompt=prompt, response_type=bool, default_response=default_response, prompter=prompter)
 
   def present_report(self, report: Union[pd.DataFrame, pd.Series], title: Optional[str]=None, prefix: Optional[str]=None, suffix: Optional[str]=None):
+    if self.quiet:
+      return
     with pd.option_context('display.max_rows', None, 'display.max_columns', None):
       prefix = f'{prefix}\n' if prefix else ''
       report_text = report.to_string() if not report.empty else 'Empty report.'
@@ -223,6 +235,17 @@ class UserInteractor:
       path,
     ])
 
+  def update_monitor(self, browser: any):
+    if self.monitor_recorder is None:
+      self.monitor_recorder = Monitor(frame_rate=self.monitor_frame_rate)
+    self.monitor_recorder.update(browser=browser)
+
+  def stop_monitor(self):
+    if self.monitor_recorder is None:
+      return
+    self.monitor_recorder.stop()
+    self.monitor_recorder = None
+
   def save_image(self, file_name: Optional[str]=None, quiet: bool=False):
     def output(message: str):
       if not quiet:
@@ -9,7 +9,7 @@ import subprocess
 
 from data_layer import Redshift as SQL
 from config import sql_config
-from raspador import ExploreScraper, ControlMode, UserInteractor, Styling, Element, RaspadorQuit, QuitManeuver
+from raspador import Raspador, BrowserPool, BrowserInteractor, WaitEngine, Parser, ExploreScraper, ControlMode, UserInteractor, Styling, Element, RaspadorQuit, QuitManeuver
 from typing import Optional, Tuple
 from credentials import raspador_slackbot_credentials
 from pathlib import Path
@@ -22,17 +22,25 @@ class Scrape:
   database_name: str
   interactivity: int
   detail_length: int
+  detail_sample_rate: float
   break_on_exceptions: bool
   monitor: bool
+  monitor_frame_rate: float
   retry: Optional[int]
+  stream_log: bool
+  quiet: bool
 
-  def __init__(self, database_name:str, interactivity: int=0, detail_length: int=2048, break_on_exceptions: bool=False, monitor: bool=False, retry: Optional[int]=None):
+  def __init__(self, database_name:str, interactivity: int=0, detail_length: int=2048, detail_sample_rate: float=1.0, break_on_exceptions: bool=False, monitor: bool=False, monitor_frame_rate: float=1.0, retry: Optional[int]=None, stream_log: bool=False, quiet: bool=False):
     self.database_name = database_name
     self.interactivity = interactivity
     self.detail_length = detail_length
+    self.detail_sample_rate = detail_sample_rate
     self.break_on_exceptions = break_on_exceptions
     self.monitor = monitor
+    self.monitor_frame_rate = monitor_frame_rate
     self.retry = retry
+    self.stream_log = stream_log
+    self.quiet = quiet
 
   def configure_user_interactivity(self, user: UserInteractor):
     user.interactive = self.interactivity > 0
@@ -41,9 +49,16 @@ class Scrape:
       if self.interactivity > 2:
         user.timeout = None
     user.abbreviated_length = self.detail_length
+    user.detail_sample_rate = self.detail_sample_rate
     user.break_on_exceptions = self.break_on_exceptions
     user.monitor = self.monitor
+    user.monitor_frame_rate = self.monitor_frame_rate
     user.retry = self.retry
+    user.quiet = self.quiet and not user.interactive
+
+  def configure_scraper_log(self, scraper: Raspador):
+    if self.stream_log:
+      scraper.stream_log()
 
 def validate_retry(ctx, param, value):
   if not value:
@@ -63,15 +78,26 @@ def validate_retry(ctx, param, value):
 @click.option('-h/-H', '--highlight/--no-highlight', 'highlight', default=False)
 @click.option('--pdb/--no-pdb', 'break_on_exceptions', default=False)
 @click.option('--monitor/--no-monitor', 'monitor', default=False)
+@click.option('--monitor-frame-rate', 'monitor_frame_rate', type=float, default=1.0)
 @click.option('-r', '--retry', 'retry', type=str, default='', callback=validate_retry)
 @click.option('-t', '--timeout', 'timeout', type=int, default=60 * 60 * 48)
 @click.option('-l', '--detail-length', 'detail_length', type=int, default=2048)
+@click.option('-ls', '--detail-sample-rate', 'detail_sample_rate', type=click.FloatRange(0, 1), default=1.0)
+@click.option('--stream-log/--no-stream-log', 'stream_log', default=False)
+@click.option('-q/-Q', '--quiet/--no-quiet', 'quiet', default=False)
+@click.option('--browser-pool-size', 'browser_pool_size', type=int, default=0)
+@click.option('--parser', 'parser_features', type=click.Choice(['html.parser', 'lxml', 'html5lib']), default='html.parser')
+@click.option('--wait-engine', type=click.Choice([e.value for e in WaitEngine]), default=WaitEngine.polling.value)
 @click.pass_context
-def run(ctx: any, database_name: str, interactivity, pretty: bool, highlight: bool, break_on_exceptions: bool, monitor: bool, retry: Optional[int], timeout: int, detail_length: int):
-  ctx.obj = Scrape(database_name=database_name, interactivity=interactivity, detail_length=detail_length, break_on_exceptions=break_on_exceptions, monitor=monitor, retry=retry)
+def run(ctx: any, database_name: str, interactivity, pretty: bool, highlight: bool, break_on_exceptions: bool, monitor: bool, monitor_frame_rate: float, retry: Optional[int], timeout: int, detail_length: int, detail_sample_rate: float, stream_log: bool, quiet: bool, browser_pool_size: int, parser_features: str, wait_engine: str):
+  ctx.obj = Scrape(database_name=database_name, interactivity=interactivity, detail_length=detail_length, detail_sample_rate=detail_sample_rate, break_on_exceptions=break_on_exceptions, monitor=monitor, monitor_frame_rate=monitor_frame_rate, retry=retry, stream_log=stream_log, quiet=quiet)
   SQL.Layer.configure_connection(sql_config[ctx.obj.database_name])
   Styling.enabled = pretty
   Element.highlight_enabled = highlight
+  Parser.features = parser_features
+  BrowserInteractor.wait_engine = WaitEngine(wait_engine)
+  if browser_pool_size > 0:
+    BrowserPool.shared = BrowserPool(max_browsers=browser_pool_size)
   if timeout > 0:
     def handle_timeout(signum, frame):
       print(f'Timeout of {timeout} seconds reached. Quitting.')
@@ -303,10 +329,14 @@ def bot_start(scrape: Scrape, bot_options: Tuple[str], project: str, configurati
   module = importlib.import_module(project)
   bot = module.Bot(configuration=configuration, interactive=scrape.interactivity > 0)
   scrape.configure_user_interactivity(user=bot.user)
+  scrape.configure_scraper_log(scraper=bot)
   try:
     bot.scrape()
   finally:
+    bot.close_log_stream()
+    bot.user.stop_monitor()
     bot.browser.driver.quit()
+    BrowserPool.close_shared()
 
 @run.command()
 @click.argument('url', default='https://example.com')
@@ -314,9 +344,12 @@ def bot_start(scrape: Scrape, bot_options: Tuple[str], project: str, configurati
 def explore(scrape: Scrape, url: str):
   scraper = ExploreScraper(configuration={'url': url}, interactive=scrape.interactivity > 0)
   scrape.configure_user_interactivity(user=scraper.user)
+  scrape.configure_scraper_log(scraper=scraper)
   try:
     scraper.scrape()
   finally:
+    scraper.close_log_stream()
+    scraper.user.stop_monitor()
     scraper.browser.driver.quit()
 
 if __name__ == '__main__':
@@ -27,14 +27,16 @@ def run(ctx: any, should_symlink: bool):
 
 @run.command()
 @click.option('-c/-C', '--cache/--no-cache', 'use_cache', is_flag=True, default=True)
+@click.option('--headless/--no-headless', 'headless', default=False)
 @click.pass_obj
-def build(context: RunContext, use_cache: bool):
+def build(context: RunContext, use_cache: bool, headless: bool):
   run_args = [
     'docker',
     'build',
     *([] if use_cache else ['--no-cache']),
     '-t', 'raspador',
     '--build-arg', f'SYMLINK={"true" if context.should_symlink else "false"}',
+    '--build-arg', f'HEADLESS={"true" if headless else "false"}',
     '.'
   ]
   print(context.quote_command(run_args=run_args))